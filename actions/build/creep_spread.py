@@ -1,78 +1,101 @@
 """Everything related to creep spreading goes here"""
-import math
+import numpy as np
 from sc2.constants import BUILD_CREEPTUMOR_QUEEN, BUILD_CREEPTUMOR_TUMOR, ZERGBUILD_CREEPTUMOR
 from sc2.data import ACTION_RESULT
 from sc2.position import Point2
 
 
 class CreepControl:
-    """It spreads creeps, finds 'optimal' locations for it"""
+    """ It spreads creeps, finds 'optimal' locations for it, the creep edge is found once per step and every tumor
+     and queen that wants to spread gets its cell from it, with one placement query for all of them """
+
+    spread_distance = 8
+    tumor_gap = 4
+    expansion_gap = 8.5
+    candidates_per_unit = 5
 
     def __init__(self):
         self.used_tumors = []
+        self.creep_requests = []
+        self.expansion_mask = self.frontier = self.frontier_loop = None
 
-    async def spread_creep(self):
-        """ Iterate over all tumors to spread itself remove used creeps"""
-        tumors = self.tumors
-        for tumor in tumors:
-            if tumor.tag not in self.used_tumors:
-                await self.place_tumor(tumor)
+    def prepare_creep_spread(self):
+        """Ground distance from the enemy main to every cell, the search covers the whole map so it's done at start"""
+        self.pathfinder.distance_field("enemy_main", self.enemy_start_locations[:1])
 
     async def place_tumor(self, unit):
-        """ Find a nice placement for the tumor and build it if possible, avoid expansion locations
-        Makes creep to the enemy base, needs a better value function for the spreading, it gets stuck on ramps"""
-        # Make sure unit can make tumor and what ability it is
-        abilities = await self.get_available_abilities(unit)
-        if BUILD_CREEPTUMOR_QUEEN in abilities:
-            unit_ability = BUILD_CREEPTUMOR_QUEEN
-        elif BUILD_CREEPTUMOR_TUMOR in abilities:
-            unit_ability = BUILD_CREEPTUMOR_TUMOR
-        else:
-            return None
-        # defining vars
-        location_attempts = 30
-        spread_distance = 8
-        location = unit.position
-        # Define random positions around unit
-        positions = [
-            Point2(
-                (
-                    location.x + spread_distance * math.cos(math.pi * alpha * 2 / location_attempts),
-                    location.y + spread_distance * math.sin(math.pi * alpha * 2 / location_attempts),
-                )
-            )
-            for alpha in range(location_attempts)
-        ]
-        # check if any of the positions are valid
-        valid_placements = await self.client.query_building_placement(
-            self.game_data.abilities[ZERGBUILD_CREEPTUMOR.value], positions
+        """Queue the unit to spread creep, spread_creep places the tumors of all queued units at once"""
+        self.creep_requests.append(unit)
+
+    def creep_frontier(self) -> np.ndarray:
+        """ Cells on the edge of the creep that can hold a tumor and keep it out of the way of the expansions,
+         found once per step """
+        if self.frontier_loop == self.state.game_loop:
+            return self.frontier
+        self.frontier_loop = self.state.game_loop
+        placement_model = self.placement_model
+        creep = placement_model.creep_cells()
+        if self.expansion_mask is None:
+            cells_x, cells_y = np.indices(creep.shape) + 0.5
+            self.expansion_mask = np.zeros(creep.shape, dtype=bool)
+            for center in self.expansion_locations:
+                self.expansion_mask |= (cells_x - center.x) ** 2 + (cells_y - center.y) ** 2 <= self.expansion_gap ** 2
+        edge = creep.copy()
+        edge[1:-1, 1:-1] &= ~(
+            creep[1:-1, 1:-1] & creep[:-2, 1:-1] & creep[2:, 1:-1] & creep[1:-1, :-2] & creep[1:-1, 2:]
         )
-        # filter valid results
-        valid_placements = [p for index, p in enumerate(positions) if valid_placements[index] == ACTION_RESULT.Success]
-        creep_destination = self.enemy_start_locations[0]
-        if valid_placements:
-            tumors = self.tumors
-            if tumors:
-                valid_placements = sorted(
-                    valid_placements,
-                    key=lambda pos: pos.distance_to_closest(tumors) - pos.distance_to_point2(creep_destination),
-                    reverse=True,
-                )
+        self.frontier = np.argwhere(edge & placement_model.grid(needs_creep=True) & ~self.expansion_mask)
+        return self.frontier
+
+    def score_frontier(self, frontier):
+        """ Cells closer to the enemy base by ground and further from our tumors are better,
+         returns the cell centers, the scores and the distance of each cell to our closest tumor """
+        points = frontier + 0.5
+        enemy_distance = self.pathfinder.distance_field("enemy_main", self.enemy_start_locations[:1])
+        scores = -enemy_distance[frontier[:, 0], frontier[:, 1]]
+        tumor_distances = np.full(len(points), np.inf)
+        if self.tumors:
+            tumor_positions = np.array([tumor.position for tumor in self.tumors])
+            tumor_distances = np.sqrt(((points[:, None, :] - tumor_positions[None, :, :]) ** 2).sum(axis=2)).min(axis=1)
+            scores = scores + tumor_distances
+        return points, scores, tumor_distances
+
+    async def spread_creep(self):
+        """ Give every queued tumor and queen its best creep cell in reach, the abilities of all of them are asked
+         together and the best few cells of each go on the same placement query"""
+        units, self.creep_requests = self.creep_requests, []
+        if not units:
+            return
+        all_abilities = await self.get_cached_abilities(units)
+        frontier = self.creep_frontier()
+        points, scores, tumor_distances = self.score_frontier(frontier)
+        plans = []
+        for unit, abilities in zip(units, all_abilities):
+            if BUILD_CREEPTUMOR_QUEEN in abilities:
+                unit_ability = BUILD_CREEPTUMOR_QUEEN
+            elif BUILD_CREEPTUMOR_TUMOR in abilities:
+                unit_ability = BUILD_CREEPTUMOR_TUMOR
             else:
-                valid_placements = sorted(valid_placements, key=lambda pos: pos.distance_to_point2(creep_destination))
-            # this is very expensive to the cpu, need optimization, keeps creep outside expansion locations
-            action = self.add_action
-            for c_location in valid_placements:
-                # 8.5 it doesnt get in the way of the injection
-                if all(c_location.distance_to_point2(el) > 8.5 for el in self.expansion_locations):
-                    if not tumors:
-                        action(unit(unit_ability, c_location))
-                        break
-                    if unit_ability == BUILD_CREEPTUMOR_QUEEN:
-                        action(unit(unit_ability, c_location))
-                        break
-                    if c_location.distance_to_closest(tumors) >= 4:
-                        action(unit(unit_ability, c_location))
-                        break
-            if unit_ability == BUILD_CREEPTUMOR_TUMOR:  # if tumor
-                self.used_tumors.append(unit.tag)
+                continue
+            in_reach = (((points - unit.position) ** 2).sum(axis=1) <= self.spread_distance ** 2) & np.isfinite(scores)
+            if unit_ability == BUILD_CREEPTUMOR_TUMOR:
+                in_reach &= tumor_distances >= self.tumor_gap
+            best = np.flatnonzero(in_reach)
+            best = best[np.argsort(-scores[best])][: self.candidates_per_unit]
+            plans.append((unit, unit_ability, [Point2(point) for point in points[best].tolist()]))
+        candidates = [point for _, _, unit_candidates in plans for point in unit_candidates]
+        if not candidates:
+            return
+        results = iter(
+            await self.client.query_building_placement(self.game_data.abilities[ZERGBUILD_CREEPTUMOR.value], candidates)
+        )
+        chosen = []
+        for unit, unit_ability, unit_candidates in plans:
+            valid_placements = [point for point in unit_candidates if next(results) == ACTION_RESULT.Success]
+            for point in valid_placements:
+                if all(point.distance_to_point2(other) >= self.tumor_gap for other in chosen):
+                    chosen.append(point)
+                    self.add_action(unit(unit_ability, point))
+                    if unit_ability == BUILD_CREEPTUMOR_TUMOR:
+                        self.used_tumors.append(unit.tag)
+                    break
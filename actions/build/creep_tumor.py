@@ -12,9 +12,11 @@ class CreepTumor:
         """Requirements to run handle"""
         local_controller = self.controller
         self.tumors = local_controller.tumors.tags_not_in(local_controller.used_tumors)
-        return self.tumors
+        return self.tumors or local_controller.creep_requests
 
     async def handle(self):
-        """Place the tumor"""
+        """Place the tumors, together with the ones the queens asked for"""
+        local_controller = self.controller
         for tumor in self.tumors:
-            await self.controller.place_tumor(tumor)
+            await local_controller.place_tumor(tumor)
+        await local_controller.spread_creep()
@@ -13,14 +13,19 @@ class BuildExtractor:
         """Couldn't find another way to build the geysers its way to inefficient,
          still trying to find the optimal number"""
         local_controller = self.controller
+        economy = local_controller.economy
         finished_bases = local_controller.townhalls.ready
-        if (local_controller.vespene * 1.25 > local_controller.minerals) or (
-            not local_controller.building_requirement(EXTRACTOR, finished_bases)
+        if (
+            not economy.gas_is_behind(1.25)
+            or economy.missing_gas_workers
+            or not local_controller.building_requirement(EXTRACTOR, finished_bases)
         ):
             return False
         gas = local_controller.extractors
         gas_amount = len(gas)
-        for geyser in local_controller.state.vespene_geyser.closer_than(10, finished_bases.random):
+        resource_index = local_controller.resource_index
+        geyser_tags = resource_index.geysers_of(resource_index.expansion_at(finished_bases.random))
+        for geyser in local_controller.state.vespene_geyser.tags_in(geyser_tags):
             self.drone = local_controller.select_build_worker(geyser.position)
             if not self.drone or local_controller.already_pending(EXTRACTOR) or gas_amount > 10:
                 return False
@@ -26,9 +26,6 @@ class BuildHive:
         return True
 
     async def morphing_lairs(self):
-        """Check if there is a lair morphing looping all hatcheries"""
+        """Check if there is a lair morphing"""
         local_controller = self.controller
-        for hatch in local_controller.lairs:
-            if await local_controller.is_morphing(hatch, CANCEL_MORPHHIVE):
-                return True
-        return False
+        return await local_controller.is_morphing(local_controller.lairs, CANCEL_MORPHHIVE)
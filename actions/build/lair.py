@@ -32,9 +32,6 @@ class BuildLair:
         return True
 
     async def morphing_hatcheries(self):
-        """Check if there is a hatchery morphing looping all hatcheries"""
+        """Check if there is a hatchery morphing"""
         local_controller = self.controller
-        for hatch in local_controller.hatcheries:
-            if await local_controller.is_morphing(hatch, CANCEL_MORPHLAIR):
-                return True
-        return False
+        return await local_controller.is_morphing(local_controller.hatcheries, CANCEL_MORPHLAIR)
@@ -31,9 +31,12 @@ class BuildSpores:
     async def handle(self):
         """Build the spore right on the middle of the base, sometimes it fails"""
         local_controller = self.controller
-        state = local_controller.state
+        resource_index = local_controller.resource_index
         for base in local_controller.townhalls.ready:
-            spore_position = (state.mineral_field | state.vespene_geyser).closer_than(10, base).center.towards(base, 1)
+            resources_center = resource_index.resources_center(resource_index.expansion_at(base))
+            if not resources_center:
+                continue
+            spore_position = resources_center.towards(base, 1)
             if not local_controller.spores.closer_than(
                 15, spore_position
             ) and not local_controller.ground_enemies.closer_than(20, spore_position):
@@ -1,54 +1,91 @@
 """Everything related to building positioning goes here"""
-from sc2.constants import EVOLUTIONCHAMBER, ENGINEERINGBAY
-from sc2.data import ACTION_RESULT
+import numpy as np
+from sc2.constants import EVOLUTIONCHAMBER
+from sc2.pathfinder import NOT_BLOCKING, footprint_half_size
 from sc2.position import Point2
 
 
 class BuildingPositioning:
-    """Ok for now"""
-
-    async def prepare_building_positions(self, center):
-        """Check all possible positions behind the mineral line when a hatchery is built"""
-        mineral_field = self.state.mineral_field
-        if mineral_field:
-            close_points = range(-11, 12)
-            center_position = center.position
-            add_positions = self.building_positions.append
-            # No point in separating it on variables, I united everything, it gets points that are behind minerals
-            viable_points = [
-                point
-                for point in (
-                    Point2((x + center_position.x, y + center_position.y))
-                    for x in close_points
-                    for y in close_points
-                    if 121 >= x * x + y * y >= 81
-                )
-                if abs(point.distance_to(mineral_field.closer_than(10, center).closest_to(point)) - 3) < 0.5
-            ]
-            e_bay_ability = self.game_data.units[ENGINEERINGBAY.value].creation_ability
-            e_bay_mask = await self.client.query_building_placement(e_bay_ability, viable_points)
-            evo_ability = self.game_data.units[EVOLUTIONCHAMBER.value].creation_ability
-            evo_mask = await self.client.query_building_placement(evo_ability, viable_points)
-            viable_points = [
-                point
-                for i, point in enumerate(viable_points)
-                if e_bay_mask[i] == ACTION_RESULT.Success and evo_mask[i] == ACTION_RESULT.Success
-            ]
-
-            for point in viable_points:
-                if self.building_positions:
-                    if all(
-                        abs(already_found.x - point.x) >= 3 or abs(already_found.y - point.y) >= 3
-                        for already_found in self.building_positions
-                    ):
-                        add_positions(point)
-                else:
-                    add_positions(point)
+    """ Slots behind the mineral line of every expansion location are planned once at the start,
+     a base's slots become available when a hatchery is built there and the slots under our structures are kept
+     occupied until they die, so finding a position doesn't need the server """
+
+    def __init__(self):
+        self.slot_positions = self.slot_rank = self.slot_occupied = self.slot_bases = None
+        self.slot_blockers = {}
+        self.slot_footprint = 1.5
+        self.activated_bases = 0
+
+    def plan_building_slots(self):
+        """Find the slots of every expansion location with array operations, the ones close to a mineral line"""
+        self.slot_footprint = self.game_data.units[EVOLUTIONCHAMBER.value].creation_ability.footprint_radius
+        offsets = np.array(
+            [(x, y) for x in range(-11, 12) for y in range(-11, 12) if 121 >= x * x + y * y >= 81], dtype=float
+        )
+        resource_index = self.resource_index
+        positions, bases = [], []
+        for base, center in enumerate(resource_index.expansions):
+            kept = []
+            mineral_tags = resource_index.minerals_of(center)
+            if not mineral_tags:
+                continue
+            close_minerals = np.array([resource_index.resource_positions[tag] for tag in mineral_tags], dtype=float)
+            points = offsets + center
+            mineral_distances = np.sqrt(((points[:, None, :] - close_minerals[None, :, :]) ** 2).sum(axis=2))
+            points = points[np.abs(mineral_distances.min(axis=1) - 3) < 0.5]
+            fits = self.placement_model.fits([Point2(point) for point in points.tolist()], self.slot_footprint)
+            for point in points[fits]:
+                # slots can't overlap each other
+                if not any(abs(found[0] - point[0]) < 3 and abs(found[1] - point[1]) < 3 for found in kept):
+                    kept.append(point)
+            positions.extend(kept)
+            bases.extend([base] * len(kept))
+        self.slot_positions = np.array(positions, dtype=float).reshape(-1, 2)
+        self.slot_bases = np.array(bases, dtype=int)
+        self.slot_rank = np.full(len(positions), np.inf)
+        self.slot_occupied = np.zeros(len(positions), dtype=int)
+        for hatchery in self.townhalls:
+            self.activate_building_slots(hatchery)
+        for structure in self.structures:
+            self.occupy_building_slots(structure)
+
+    def activate_building_slots(self, hatchery):
+        """Make the slots of the base the hatchery is at available, in the order the bases were taken"""
+        if self.slot_positions is None:
+            return
+        expansion = self.resource_index.expansion_at(hatchery)
+        if expansion is None:
+            return
+        base = self.resource_index.expansions.index(expansion)
+        new_slots = np.flatnonzero((self.slot_bases == base) & np.isinf(self.slot_rank))
+        self.slot_rank[new_slots] = self.activated_bases * len(self.slot_rank) + np.arange(len(new_slots))
+        self.activated_bases += 1
+
+    def occupy_building_slots(self, structure):
+        """Mark the slots the structure overlaps as occupied"""
+        if self.slot_positions is None or structure.type_id in NOT_BLOCKING:
+            return
+        reach = footprint_half_size(structure.radius) + self.slot_footprint
+        blocked = np.flatnonzero((np.abs(self.slot_positions - structure.position) < reach).all(axis=1))
+        self.slot_occupied[blocked] += 1
+        self.slot_blockers[structure.tag] = blocked
+
+    def free_building_slots(self, tag):
+        """Release the slots of a structure that died"""
+        blocked = self.slot_blockers.pop(tag, None)
+        if blocked is not None:
+            self.slot_occupied[blocked] -= 1
 
     async def get_production_position(self):
-        """Find the safest position looping through all possible ones"""
-        if self.building_positions:
-            for building_position in self.building_positions:
-                if await self.can_place(EVOLUTIONCHAMBER, building_position):
-                    return building_position
-        return None
+        """First free slot of the earliest taken base that already has creep"""
+        if self.slot_positions is None:
+            return None
+        free = np.flatnonzero(np.isfinite(self.slot_rank) & (self.slot_occupied == 0))
+        if not free.size:
+            return None
+        free = free[np.argsort(self.slot_rank[free])]
+        points = [Point2(point) for point in self.slot_positions[free].tolist()]
+        fits = self.placement_model.fits(points, self.slot_footprint, needs_creep=True)
+        if not fits.any():
+            return None
+        return points[int(np.argmax(fits))]
@@ -0,0 +1,66 @@
+"""Everything related to reading the state of the economy goes here"""
+
+
+class EconomyModel:
+    """ Income, saturation and projected bank, updated once per step and shared by the commands that decide
+     between minerals, gas and drones so none of them has to scan the bases again """
+
+    projection_seconds = 10
+    max_workers = 90
+
+    def __init__(self, main):
+        self.controller = main
+        self.game_loop = None
+        self.mineral_income = self.vespene_income = 0
+        self.saturation = {}
+        self.ideal_workers = self.assigned_workers = self.ideal_gas_workers = self.assigned_gas_workers = 0
+
+    def update(self):
+        """Read the rates from the score and the saturation of every place, once per step"""
+        local_controller = self.controller
+        if self.game_loop == local_controller.state.game_loop:
+            return
+        self.game_loop = local_controller.state.game_loop
+        score = local_controller.state.score
+        self.mineral_income, self.vespene_income = score.collection_rate_minerals, score.collection_rate_vespene
+        self.saturation = {
+            place.tag: (place.assigned_harvesters, place.ideal_harvesters)
+            for place in local_controller.townhalls | local_controller.extractors
+        }
+        extractor_tags = {extractor.tag for extractor in local_controller.extractors}
+        self.ideal_workers = self.assigned_workers = self.ideal_gas_workers = self.assigned_gas_workers = 0
+        for tag, (assigned, ideal) in self.saturation.items():
+            self.ideal_workers += ideal
+            self.assigned_workers += assigned
+            if tag in extractor_tags:
+                self.ideal_gas_workers += ideal
+                self.assigned_gas_workers += assigned
+
+    @property
+    def projected_minerals(self):
+        """Minerals on the bank after the projection time at the current income, the rate is per minute"""
+        return self.controller.minerals + self.mineral_income * self.projection_seconds / 60
+
+    @property
+    def projected_vespene(self):
+        """Vespene on the bank after the projection time at the current income, the rate is per minute"""
+        return self.controller.vespene + self.vespene_income * self.projection_seconds / 60
+
+    def gas_is_behind(self, ratio):
+        """ If the projected vespene times the ratio is still lower than the projected minerals, the horizon is short
+         so the banks still weigh more than the incomes and spending the minerals brings the gas back in line """
+        return self.projected_vespene * ratio < self.projected_minerals
+
+    @property
+    def missing_gas_workers(self):
+        """Drones the extractors still need to be saturated"""
+        return max(self.ideal_gas_workers - self.assigned_gas_workers, 0)
+
+    @property
+    def optimal_workers(self):
+        """Drones needed to saturate every base and extractor, capped for the army to have supply"""
+        return min(self.ideal_workers, self.max_workers - len(self.controller.extractors))
+
+    def saturation_of(self, place):
+        """How many drones the place has and how many it wants"""
+        return self.saturation.get(place.tag, (0, 0))
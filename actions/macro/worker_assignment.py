@@ -0,0 +1,125 @@
+"""Everything related to keeping track of which resource every drone is working goes here"""
+from collections import Counter, defaultdict
+import numpy as np
+
+
+def min_cost_matching(costs: np.ndarray) -> list:
+    """ Hungarian algorithm, the column matched to each row with the lowest total cost,
+     rows that are left without a column when there are more rows than columns get None """
+    rows, columns = costs.shape
+    if rows > columns:
+        matched_rows = min_cost_matching(costs.T)
+        result = [None] * rows
+        for column, row in enumerate(matched_rows):
+            result[row] = column
+        return result
+    row_potential, column_potential = np.zeros(rows + 1), np.zeros(columns + 1)
+    owner, previous = np.zeros(columns + 1, dtype=int), np.zeros(columns + 1, dtype=int)
+    for row in range(1, rows + 1):
+        owner[0], current = row, 0
+        slack, used = np.full(columns + 1, np.inf), np.zeros(columns + 1, dtype=bool)
+        while owner[current]:
+            used[current] = True
+            reduced = costs[owner[current] - 1] - row_potential[owner[current]] - column_potential[1:]
+            free = ~used[1:]
+            better = free & (reduced < slack[1:])
+            slack[1:][better], previous[1:][better] = reduced[better], current
+            free_slack = np.where(free, slack[1:], np.inf)
+            following = int(np.argmin(free_slack)) + 1
+            delta = free_slack[following - 1]
+            used_columns = np.flatnonzero(used)
+            row_potential[owner[used_columns]] += delta
+            column_potential[used_columns] -= delta
+            slack[1:][free] -= delta
+            current = following
+        while current:
+            owner[current] = owner[previous[current]]
+            current = previous[current]
+    result = [None] * rows
+    for column in np.flatnonzero(owner[1:]):
+        result[owner[column + 1] - 1] = int(column)
+    return result
+
+
+class WorkerAssignment:
+    """ Tag-keyed map of the base and resource every drone works, with the amount of drones on each base and field.
+     Only the drones that changed their order target since last step are looked at, returning cargo keeps the field """
+
+    def __init__(self):
+        self.targets = {}
+        self.assignments = {}
+        self.place_workers = defaultdict(set)
+        self.field_counts = Counter()
+        self.field_places = {}
+        self.place_fields = defaultdict(list)
+        self.places_key = None
+
+    def map_fields(self, bases, extractors, resource_index):
+        """ Which base or extractor each resource belongs to, read from the resource index, only rebuilt when a base
+         or extractor appeared or disappeared or a field was depleted, and then every drone is looked at again"""
+        places_key = (frozenset(bases.tags), frozenset(extractors.tags), resource_index.version)
+        if places_key == self.places_key:
+            return
+        self.places_key = places_key
+        self.field_places = {extractor.tag: extractor.tag for extractor in extractors}
+        self.place_fields = defaultdict(list)
+        for base in bases:
+            for tag in resource_index.minerals_of(resource_index.expansion_at(base)):
+                self.field_places[tag] = base.tag
+                self.place_fields[base.tag].append(tag)
+        self.targets = {}
+
+    def assign(self, tag, place, field):
+        """Move the drone to the field and update the counters"""
+        self.unassign(tag)
+        self.assignments[tag] = place, field
+        self.place_workers[place].add(tag)
+        self.field_counts[field] += 1
+
+    def unassign(self, tag):
+        """Take the drone out of the counters"""
+        assignment = self.assignments.pop(tag, None)
+        if assignment:
+            place, field = assignment
+            self.place_workers[place].discard(tag)
+            self.field_counts[field] -= 1
+
+    def update(self, drones, bases, extractors, resource_index):
+        """Follow the order targets of the drones, only the new, dead or changed ones are touched"""
+        self.map_fields(bases, extractors, resource_index)
+        base_tags = {base.tag for base in bases}
+        current = {drone.tag: drone.order_target for drone in drones}
+        for tag in self.assignments.keys() - current.keys():
+            self.unassign(tag)
+        for tag, target in current.items():
+            if tag in self.targets and self.targets[tag] == target:
+                continue
+            if target in self.field_places:
+                self.assign(tag, self.field_places[target], target)
+            elif target not in base_tags:
+                self.unassign(tag)
+        self.targets = current
+
+    def surplus_workers(self, place, amount, drones_by_tag, taken) -> list:
+        """The drones of an oversaturated place that are the closest to it, excluding the ones already moving"""
+        workers = [drones_by_tag[tag] for tag in self.place_workers[place.tag] if tag not in taken]
+        workers.sort(key=lambda worker: worker.distance_to(place))
+        return workers[:amount]
+
+    def match(self, workers, slots) -> list:
+        """Pairs each worker to a free slot of a place with the lowest total travel distance"""
+        if not workers or not slots:
+            return []
+        worker_positions = np.array([worker.position for worker in workers])
+        slot_positions = np.array([slot.position for slot in slots])
+        costs = np.sqrt(((worker_positions[:, None, :] - slot_positions[None, :, :]) ** 2).sum(axis=2))
+        return [
+            (worker, slots[slot]) for worker, slot in zip(workers, min_cost_matching(costs)) if slot is not None
+        ]
+
+    def free_field(self, place, mineral_fields_by_tag):
+        """The field of the base with the least drones on it, the richest of them on a tie"""
+        fields = [mineral_fields_by_tag[tag] for tag in self.place_fields[place.tag] if tag in mineral_fields_by_tag]
+        if not fields:
+            return None
+        return min(fields, key=lambda field: (self.field_counts[field.tag], -field.mineral_contents))
@@ -1,5 +1,6 @@
 """Everything related to army value tables go here"""
 import numpy as np
+from sc2 import RACE
 from sc2.constants import (
     ADEPT,
     ARCHON,
@@ -64,15 +65,24 @@ from sc2.constants import (
     ZEALOT,
     ZERGLING,
 )
+from sc2.ids.unit_typeid import UnitTypeId
 
 
-def general_calculation(table, targets):
-    """Returns the sum of all targets unit values, if the id is unknown, add it as value 1"""
-    total = 0
-    for enemy in targets:
-        table.setdefault(enemy.type_id, 1)
-        total += table[enemy.type_id]
-    return total
+UNKNOWN_TYPE = max(unit_type.value for unit_type in UnitTypeId) + 1
+
+
+def compile_table(table):
+    """ Turns a table into an array indexed by the unit type id, so many values can be looked up at once,
+     every unknown id has value 1 """
+    values = np.ones(UNKNOWN_TYPE + 1)
+    for unit_type, value in table.items():
+        values[unit_type.value] = value
+    return values
+
+
+def type_ids(units) -> np.ndarray:
+    """Returns the unit type ids of the units as an array, unknown ones are clipped to the last slot"""
+    return np.minimum(np.fromiter((unit.proto.unit_type for unit in units), int, len(units)), UNKNOWN_TYPE)
 
 
 class EnemyArmyValue:
@@ -86,258 +96,212 @@ class EnemyArmyValue:
     massive_countered = 0.2
     worker = 0.01
 
-    def protoss_value_for_zerglings(self, combined_enemies):
-        """Calculate the enemy army value for zerglings vs protoss"""
-        protoss_as_zergling_table = {
-            COLOSSUS: self.massive_counter,
-            ADEPT: self.advantage,
-            ARCHON: self.counter,
-            STALKER: self.countered,
-            DARKTEMPLAR: self.normal,
-            PHOTONCANNON: self.counter,
-            ZEALOT: self.advantage,
-            SENTRY: self.countered,
-            PROBE: self.worker,
-            HIGHTEMPLAR: self.countered,
-            DISRUPTOR: self.counter,
-            IMMORTAL: self.advantage,
-        }
-        return general_calculation(protoss_as_zergling_table, combined_enemies)
-
-    def protoss_value_for_hydralisks(self, combined_enemies):
-        """Calculate the enemy army value for hydralisks vs protoss"""
-        protoss_as_hydralisks_table = {
-            PHOENIX: self.countered,
-            ORACLE: self.countered,
-            COLOSSUS: self.counter,
-            ADEPT: self.normal,
-            ARCHON: self.advantage,
-            STALKER: self.normal,
-            DARKTEMPLAR: self.countered,
-            PHOTONCANNON: self.counter,
-            ZEALOT: self.countered,
-            SENTRY: self.massive_countered,
-            PROBE: self.worker,
-            HIGHTEMPLAR: self.countered,
-            CARRIER: self.massive_counter,
-            DISRUPTOR: self.advantage,
-            IMMORTAL: self.counter,
-            TEMPEST: self.normal,
-            VOIDRAY: self.countered,
-            MOTHERSHIP: self.normal,
-        }
-        return general_calculation(protoss_as_hydralisks_table, combined_enemies)
+    protoss_as_zergling_table = {
+        COLOSSUS: massive_counter,
+        ADEPT: advantage,
+        ARCHON: counter,
+        STALKER: countered,
+        DARKTEMPLAR: normal,
+        PHOTONCANNON: counter,
+        ZEALOT: advantage,
+        SENTRY: countered,
+        PROBE: worker,
+        HIGHTEMPLAR: countered,
+        DISRUPTOR: counter,
+        IMMORTAL: advantage,
+    }
 
-    def protoss_value_for_ultralisks(self, combined_enemies):
-        """Calculate the enemy army value for ultralisks vs protoss"""
-        protoss_as_ultralisks_table = {
-            COLOSSUS: self.countered,
-            ADEPT: self.countered,
-            ARCHON: self.advantage,
-            STALKER: self.countered,
-            DARKTEMPLAR: self.countered,
-            PHOTONCANNON: self.normal,
-            ZEALOT: self.normal,
-            SENTRY: self.countered,
-            PROBE: self.worker,
-            HIGHTEMPLAR: self.massive_countered,
-            DISRUPTOR: self.normal,
-            IMMORTAL: self.massive_counter,
-        }
-        return general_calculation(protoss_as_ultralisks_table, combined_enemies)
+    protoss_as_hydralisks_table = {
+        PHOENIX: countered,
+        ORACLE: countered,
+        COLOSSUS: counter,
+        ADEPT: normal,
+        ARCHON: advantage,
+        STALKER: normal,
+        DARKTEMPLAR: countered,
+        PHOTONCANNON: counter,
+        ZEALOT: countered,
+        SENTRY: massive_countered,
+        PROBE: worker,
+        HIGHTEMPLAR: countered,
+        CARRIER: massive_counter,
+        DISRUPTOR: advantage,
+        IMMORTAL: counter,
+        TEMPEST: normal,
+        VOIDRAY: countered,
+        MOTHERSHIP: normal,
+    }
 
-    def terran_value_for_zerglings(self, combined_enemies):
-        """Calculate the enemy army value for zerglings vs terran"""
-        terran_as_zergling_table = {
-            AUTOTURRET: self.counter,
-            BUNKER: self.counter,
-            HELLION: self.counter,
-            HELLIONTANK: self.massive_counter,
-            CYCLONE: self.countered,
-            GHOST: self.countered,
-            MARAUDER: self.countered,
-            MARINE: self.normal,
-            REAPER: self.countered,
-            SCV: self.worker,
-            SIEGETANKSIEGED: self.massive_counter,
-            SIEGETANK: self.advantage,
-            THOR: self.countered,
-            VIKINGASSAULT: self.countered,
-        }
-        return general_calculation(terran_as_zergling_table, combined_enemies)
+    protoss_as_ultralisks_table = {
+        COLOSSUS: countered,
+        ADEPT: countered,
+        ARCHON: advantage,
+        STALKER: countered,
+        DARKTEMPLAR: countered,
+        PHOTONCANNON: normal,
+        ZEALOT: normal,
+        SENTRY: countered,
+        PROBE: worker,
+        HIGHTEMPLAR: massive_countered,
+        DISRUPTOR: normal,
+        IMMORTAL: massive_counter,
+    }
 
-    def terran_value_for_hydralisks(self, combined_enemies):
-        """Calculate the enemy army value for hydralisks vs terran"""
-        terran_as_hydralisk_table = {
-            AUTOTURRET: self.advantage,
-            BUNKER: self.normal,
-            HELLION: self.countered,
-            HELLIONTANK: self.advantage,
-            CYCLONE: self.normal,
-            GHOST: self.normal,
-            MARAUDER: self.counter,
-            MARINE: self.countered,
-            REAPER: self.countered,
-            SCV: self.worker,
-            SIEGETANKSIEGED: self.massive_counter,
-            SIEGETANK: self.advantage,
-            THOR: self.normal,
-            VIKINGASSAULT: self.countered,
-            BANSHEE: self.countered,
-            BATTLECRUISER: self.normal,
-            LIBERATOR: self.counter,
-            MEDIVAC: self.massive_countered,
-            VIKINGFIGHTER: self.massive_countered,
-        }
-        return general_calculation(terran_as_hydralisk_table, combined_enemies)
+    terran_as_zergling_table = {
+        AUTOTURRET: counter,
+        BUNKER: counter,
+        HELLION: counter,
+        HELLIONTANK: massive_counter,
+        CYCLONE: countered,
+        GHOST: countered,
+        MARAUDER: countered,
+        MARINE: normal,
+        REAPER: countered,
+        SCV: worker,
+        SIEGETANKSIEGED: massive_counter,
+        SIEGETANK: advantage,
+        THOR: countered,
+        VIKINGASSAULT: countered,
+    }
 
-    def terran_value_for_ultralisks(self, combined_enemies):
-        """Calculate the enemy army value for ultralisks vs terran"""
-        terran_as_ultralisk_table = {
-            AUTOTURRET: self.countered,
-            BUNKER: self.countered,
-            HELLION: self.massive_countered,
-            HELLIONTANK: self.countered,
-            CYCLONE: self.countered,
-            GHOST: self.counter,
-            MARAUDER: self.advantage,
-            MARINE: self.massive_countered,
-            REAPER: self.massive_countered,
-            SCV: self.worker,
-            SIEGETANKSIEGED: self.counter,
-            SIEGETANK: self.countered,
-            THOR: self.counter,
-            VIKINGASSAULT: self.countered,
-        }
-        return general_calculation(terran_as_ultralisk_table, combined_enemies)
+    terran_as_hydralisk_table = {
+        AUTOTURRET: advantage,
+        BUNKER: normal,
+        HELLION: countered,
+        HELLIONTANK: advantage,
+        CYCLONE: normal,
+        GHOST: normal,
+        MARAUDER: counter,
+        MARINE: countered,
+        REAPER: countered,
+        SCV: worker,
+        SIEGETANKSIEGED: massive_counter,
+        SIEGETANK: advantage,
+        THOR: normal,
+        VIKINGASSAULT: countered,
+        BANSHEE: countered,
+        BATTLECRUISER: normal,
+        LIBERATOR: counter,
+        MEDIVAC: massive_countered,
+        VIKINGFIGHTER: massive_countered,
+    }
 
-    def zerg_value_for_zerglings(self, combined_enemies):
-        """Calculate the enemy army value for zerglings vs zerg"""
-        zerg_as_zergling_table = {
-            LARVA: 0,
-            QUEEN: self.normal,
-            ZERGLING: self.normal,
-            BANELING: self.advantage,
-            ROACH: self.normal,
-            RAVAGER: self.normal,
-            HYDRALISK: self.normal,
-            LURKERMP: self.normal,
-            DRONE: self.worker,
-            LURKERMPBURROWED: self.massive_counter,
-            INFESTOR: self.countered,
-            INFESTEDTERRAN: self.normal,
-            INFESTEDTERRANSEGG: self.massive_countered,
-            SWARMHOSTMP: self.countered,
-            LOCUSTMP: self.counter,
-            ULTRALISK: self.massive_counter,
-            SPINECRAWLER: self.counter,
-            BROODLING: self.normal,
-        }
-        return general_calculation(zerg_as_zergling_table, combined_enemies)
+    terran_as_ultralisk_table = {
+        AUTOTURRET: countered,
+        BUNKER: countered,
+        HELLION: massive_countered,
+        HELLIONTANK: countered,
+        CYCLONE: countered,
+        GHOST: counter,
+        MARAUDER: advantage,
+        MARINE: massive_countered,
+        REAPER: massive_countered,
+        SCV: worker,
+        SIEGETANKSIEGED: counter,
+        SIEGETANK: countered,
+        THOR: counter,
+        VIKINGASSAULT: countered,
+    }
 
-    def zerg_value_for_hydralisk(self, combined_enemies):
-        """Calculate the enemy army value for hydralisks vs zerg"""
-        zerg_as_hydralisk_table = {
-            LARVA: 0,
-            QUEEN: self.normal,
-            ZERGLING: self.normal,
-            BANELING: self.counter,
-            ROACH: self.normal,
-            RAVAGER: self.normal,
-            HYDRALISK: self.normal,
-            LURKERMP: self.countered,
-            DRONE: self.worker,
-            LURKERMPBURROWED: self.massive_counter,
-            INFESTOR: self.countered,
-            INFESTEDTERRAN: self.countered,
-            INFESTEDTERRANSEGG: self.massive_countered,
-            SWARMHOSTMP: self.massive_countered,
-            LOCUSTMP: self.normal,
-            ULTRALISK: self.massive_counter,
-            SPINECRAWLER: self.normal,
-            LOCUSTMPFLYING: self.countered,
-            OVERLORD: 0,
-            OVERSEER: 0,
-            MUTALISK: self.countered,
-            CORRUPTOR: 0,
-            VIPER: self.countered,
-            BROODLORD: self.normal,
-            BROODLING: self.countered,
-        }
-        return general_calculation(zerg_as_hydralisk_table, combined_enemies)
+    zerg_as_zergling_table = {
+        LARVA: 0,
+        QUEEN: normal,
+        ZERGLING: normal,
+        BANELING: advantage,
+        ROACH: normal,
+        RAVAGER: normal,
+        HYDRALISK: normal,
+        LURKERMP: normal,
+        DRONE: worker,
+        LURKERMPBURROWED: massive_counter,
+        INFESTOR: countered,
+        INFESTEDTERRAN: normal,
+        INFESTEDTERRANSEGG: massive_countered,
+        SWARMHOSTMP: countered,
+        LOCUSTMP: counter,
+        ULTRALISK: massive_counter,
+        SPINECRAWLER: counter,
+        BROODLING: normal,
+    }
 
-    def zerg_value_for_ultralisks(self, combined_enemies):
-        """Calculate the enemy army value for ultralisks vs zerg"""
-        zerg_as_ultralisk_table = {
-            LARVA: 0,
-            QUEEN: self.countered,
-            ZERGLING: self.massive_countered,
-            BANELING: self.massive_countered,
-            ROACH: self.countered,
-            RAVAGER: self.countered,
-            HYDRALISK: self.countered,
-            LURKERMP: self.countered,
-            DRONE: self.worker,
-            LURKERMPBURROWED: self.counter,
-            INFESTOR: self.countered,
-            INFESTEDTERRAN: self.countered,
-            INFESTEDTERRANSEGG: self.massive_countered,
-            SWARMHOSTMP: self.massive_countered,
-            LOCUSTMP: self.counter,
-            ULTRALISK: self.normal,
-            SPINECRAWLER: self.normal,
-            BROODLING: self.countered,
-        }
-        return general_calculation(zerg_as_ultralisk_table, combined_enemies)
+    zerg_as_hydralisk_table = {
+        LARVA: 0,
+        QUEEN: normal,
+        ZERGLING: normal,
+        BANELING: counter,
+        ROACH: normal,
+        RAVAGER: normal,
+        HYDRALISK: normal,
+        LURKERMP: countered,
+        DRONE: worker,
+        LURKERMPBURROWED: massive_counter,
+        INFESTOR: countered,
+        INFESTEDTERRAN: countered,
+        INFESTEDTERRANSEGG: massive_countered,
+        SWARMHOSTMP: massive_countered,
+        LOCUSTMP: normal,
+        ULTRALISK: massive_counter,
+        SPINECRAWLER: normal,
+        LOCUSTMPFLYING: countered,
+        OVERLORD: 0,
+        OVERSEER: 0,
+        MUTALISK: countered,
+        CORRUPTOR: 0,
+        VIPER: countered,
+        BROODLORD: normal,
+        BROODLING: countered,
+    }
 
-    def enemy_value_terran(self, unit, target_group):
-        """Returns the right enemy value based on the unit vs terran"""
-        if unit.type_id == ZERGLING:
-            return self.terran_value_for_zerglings(target_group)
-        if unit.type_id == HYDRALISK:
-            return self.terran_value_for_hydralisks(target_group)
-        return self.terran_value_for_ultralisks(target_group)
+    zerg_as_ultralisk_table = {
+        LARVA: 0,
+        QUEEN: countered,
+        ZERGLING: massive_countered,
+        BANELING: massive_countered,
+        ROACH: countered,
+        RAVAGER: countered,
+        HYDRALISK: countered,
+        LURKERMP: countered,
+        DRONE: worker,
+        LURKERMPBURROWED: counter,
+        INFESTOR: countered,
+        INFESTEDTERRAN: countered,
+        INFESTEDTERRANSEGG: massive_countered,
+        SWARMHOSTMP: massive_countered,
+        LOCUSTMP: counter,
+        ULTRALISK: normal,
+        SPINECRAWLER: normal,
+        BROODLING: countered,
+    }
+    value_tables = {
+        (RACE.Protoss, ZERGLING): compile_table(protoss_as_zergling_table),
+        (RACE.Protoss, HYDRALISK): compile_table(protoss_as_hydralisks_table),
+        (RACE.Protoss, ULTRALISK): compile_table(protoss_as_ultralisks_table),
+        (RACE.Terran, ZERGLING): compile_table(terran_as_zergling_table),
+        (RACE.Terran, HYDRALISK): compile_table(terran_as_hydralisk_table),
+        (RACE.Terran, ULTRALISK): compile_table(terran_as_ultralisk_table),
+        (RACE.Zerg, ZERGLING): compile_table(zerg_as_zergling_table),
+        (RACE.Zerg, HYDRALISK): compile_table(zerg_as_hydralisk_table),
+        (RACE.Zerg, ULTRALISK): compile_table(zerg_as_ultralisk_table),
+    }
 
-    def enemy_value_protoss(self, unit, target_group):
-        """Returns the right enemy value based on the unit vs protoss"""
-        if unit.type_id == ZERGLING:
-            return self.protoss_value_for_zerglings(target_group)
-        if unit.type_id == HYDRALISK:
-            return self.protoss_value_for_hydralisks(target_group)
-        return self.protoss_value_for_ultralisks(target_group)
+    def value_table(self, unit_type) -> np.ndarray:
+        """Returns the compiled table of the enemy race against the given unit type of ours,
+         unlisted types of ours are evaluated as ultralisks and unknown races as protoss"""
+        enemy_race = self.controller.enemy_race
+        if enemy_race not in (RACE.Zerg, RACE.Terran):
+            enemy_race = RACE.Protoss
+        if unit_type not in (ZERGLING, HYDRALISK):
+            unit_type = ULTRALISK
+        return self.value_tables[(enemy_race, unit_type)]
 
-    def enemy_value_zerg(self, unit, target_group):
-        """Returns the right enemy value based on the unit vs zerg"""
-        if unit.type_id == ZERGLING:
-            return self.zerg_value_for_zerglings(target_group)
-        if unit.type_id == HYDRALISK:
-            return self.zerg_value_for_hydralisk(target_group)
-        return self.zerg_value_for_ultralisks(target_group)
+    def enemy_unit_values(self, unit_type, enemies) -> np.ndarray:
+        """Returns the value of each enemy against the given unit type of ours"""
+        return self.value_table(unit_type)[type_ids(enemies)]
 
     def battling_force_value(self, unit_position, zvalue, hvalue, uvalue):
         """Returns the right value for our army that is in battle"""
-        local_controller = self.controller
-        return np.sum(
-            np.array(
-                [
-                    len(local_controller.zerglings.closer_than(13, unit_position)),
-                    len(local_controller.hydras.closer_than(13, unit_position)),
-                    len(local_controller.ultralisks.closer_than(13, unit_position)),
-                ]
-            )
-            * np.array([zvalue, hvalue, uvalue])
-        )
+        return self.influence_map.force_value(unit_position, (zvalue, hvalue, uvalue))
 
     def gathering_force_value(self, zvalue, hvalue, uvalue):
         """Returns the right value for our army that is gathering"""
-        local_controller = self.controller
-        return np.sum(
-            np.array(
-                [
-                    len(local_controller.zerglings.ready),
-                    len(local_controller.hydras.ready),
-                    len(local_controller.ultralisks.ready),
-                ]
-            )
-            * np.array([zvalue, hvalue, uvalue])
-        )
+        return self.influence_map.ready_force_value((zvalue, hvalue, uvalue))
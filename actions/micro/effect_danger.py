@@ -0,0 +1,84 @@
+"""Everything related to the grid of the dangerous effects goes here"""
+from math import hypot
+import numpy as np
+from sc2.constants import (
+    GUARDIANSHIELDPERSISTENT,
+    LIBERATORTARGETMORPHDELAYPERSISTENT,
+    LIBERATORTARGETMORPHPERSISTENT,
+    SCANNERSWEEP,
+)
+from sc2.position import Point2
+
+ESCAPE_OFFSETS = np.array([(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)], dtype=float)
+
+
+class EffectDangerMap:
+    """ The effects of the step are stamped on a grid once, every cell close to one keeps the closest effect position,
+     its radius and which of the 8 directions leads away from the effect, so each unit checks in O(1) """
+
+    unit_margin = 2
+    excluded_effects = (
+        SCANNERSWEEP,
+        GUARDIANSHIELDPERSISTENT,
+        LIBERATORTARGETMORPHDELAYPERSISTENT,
+        LIBERATORTARGETMORPHPERSISTENT,
+    )  # Placeholder(must find better way to handle some of these)
+
+    def __init__(self, main):
+        self.controller = main
+        self.clearance = self.closest = self.radius = self.escape = None
+        self.active = False
+
+    def update(self):
+        """Stamp every effect position with the radius of its effect, the lowest distance to an edge wins the cell"""
+        local_controller = self.controller
+        effects = [effect for effect in local_controller.state.effects if effect.id not in self.excluded_effects]
+        self.active = bool(effects)
+        if not self.active:
+            return
+        if self.escape is None:
+            shape = local_controller.game_info.pathing_grid.as_array().shape
+            self.closest, self.radius, self.escape = np.zeros((*shape, 2)), np.zeros(shape), np.zeros(shape, dtype=int)
+        self.clearance = np.full(self.escape.shape, np.inf)
+        for effect in effects:
+            radius = local_controller.game_data.effects[effect.id].radius
+            positions = effect.position_array
+            center = positions.center
+            for position in positions.array:
+                self.stamp(position, radius, center)
+
+    def stamp(self, position, radius, center):
+        """Mark the cells close to one position of an effect"""
+        reach = radius + self.unit_margin
+        width, height = self.clearance.shape
+        x_cells = np.arange(max(0, int(position[0] - reach)), min(width, int(position[0] + reach) + 2))
+        y_cells = np.arange(max(0, int(position[1] - reach)), min(height, int(position[1] + reach) + 2))
+        if not x_cells.size or not y_cells.size:
+            return
+        window = (slice(x_cells[0], x_cells[-1] + 1), slice(y_cells[0], y_cells[-1] + 1))
+        distances = np.sqrt((x_cells[:, None] - position[0]) ** 2 + (y_cells[None, :] - position[1]) ** 2) - radius
+        closer = (distances < reach - radius) & (distances < self.clearance[window])
+        self.clearance[window] = np.where(closer, distances, self.clearance[window])
+        self.closest[window] = np.where(closer[..., None], position, self.closest[window])
+        self.radius[window] = np.where(closer, radius, self.radius[window])
+        angles = np.arctan2(y_cells[None, :] - center[1], x_cells[:, None] - center[0])
+        self.escape[window] = np.where(closer, np.round(angles / (np.pi / 4)).astype(int) % 8, self.escape[window])
+
+    def cell(self, position):
+        """Returns the grid cell of the position, clamped to the map"""
+        width, height = self.clearance.shape
+        return min(max(int(round(position[0])), 0), width - 1), min(max(int(round(position[1])), 0), height - 1)
+
+    def escape_point(self, unit):
+        """Where the unit should move to get out of an effect, None if it isn't in one"""
+        if not self.active:
+            return None
+        cell = self.cell(unit.position)
+        if np.isinf(self.clearance[cell]):
+            return None
+        danger_zone = self.radius[cell] + unit.radius + 0.1
+        if unit.position.distance_to_point2(self.closest[cell]) >= danger_zone:
+            return None
+        offset_x, offset_y = ESCAPE_OFFSETS[self.escape[cell]].tolist()
+        step = (hypot(offset_x, offset_y) + float(danger_zone)) / hypot(offset_x, offset_y)
+        return Point2((unit.position.x + offset_x * step, unit.position.y + offset_y * step))
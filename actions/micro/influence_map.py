@@ -0,0 +1,114 @@
+"""Everything related to the enemy influence grids goes here"""
+import numpy as np
+from sc2.constants import HYDRALISK, ULTRALISK, ZERGLING
+from sc2.position import Point2
+
+
+class InfluenceMap:
+    """Grids built once per step from the enemy and our army, so each unit reads its local strength in O(1)"""
+
+    value_radius = 20
+    force_radius = 13
+    threat_radius = 14
+    weapon_margin = 1
+    army_types = (ZERGLING, HYDRALISK, ULTRALISK)
+
+    def __init__(self, main):
+        self.controller = main
+        self.pathable = self.ground = self.air = self.close_threats = self.own_force = None
+        self.enemy_values = {}
+        self.ready_army = np.zeros(len(self.army_types))
+
+    def update(self, army_value, targets, hydra_targets):
+        """ Stamp all layers for the step
+        - ground and air: dps of every enemy weapon that reaches the cell, used to find safe cells
+        - enemy_values: enemy army value closer than 20, one grid for each of our unit types
+        - close_threats: amount of hydra targets closer than 14, padded by one cell, so an exact search
+         around a unit can be skipped only when it would surely find nothing
+        - own_force: amount of zerglings, hydras and ultralisks closer than 13, one layer for each"""
+        local_controller = self.controller
+        if self.pathable is None:
+            self.pathable = local_controller.game_info.pathing_grid.as_array() == 0
+        shape = self.pathable.shape
+        self.ground, self.air, self.close_threats = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+        self.own_force = np.zeros((len(self.army_types), *shape))
+        self.enemy_values = {}
+        for enemy in hydra_targets or ():
+            position = enemy.position
+            self.stamp(self.close_threats, position, self.threat_radius + 1, 1)
+            reach = enemy.radius + self.weapon_margin
+            if enemy.can_attack_ground:
+                self.stamp(self.ground, position, enemy.ground_range + reach, enemy.ground_dps)
+            if enemy.can_attack_air:
+                self.stamp(self.air, position, enemy.air_range + reach, enemy.air_dps)
+        for unit_type in self.army_types:
+            enemies = hydra_targets if unit_type == HYDRALISK else targets
+            grid = self.enemy_values[unit_type] = np.zeros(shape)
+            if not enemies:
+                continue
+            for enemy, value in zip(enemies, army_value.enemy_unit_values(unit_type, enemies)):
+                self.stamp(grid, enemy.position, self.value_radius, value)
+        army_groups = (local_controller.zerglings, local_controller.hydras, local_controller.ultralisks)
+        for layer, group in zip(self.own_force, army_groups):
+            for unit in group:
+                self.stamp(layer, unit.position, self.force_radius, 1)
+        self.ready_army = np.array([len(group.ready) for group in army_groups])
+
+    @staticmethod
+    def stamp(grid, position, radius, value):
+        """Add the value to every cell closer than the radius to the position"""
+        if radius <= 0 or not value:
+            return
+        pos_x, pos_y = position
+        width, height = grid.shape
+        x_cells = np.arange(max(0, int(pos_x - radius) + 1), min(width, int(pos_x + radius) + 1))
+        y_cells = np.arange(max(0, int(pos_y - radius) + 1), min(height, int(pos_y + radius) + 1))
+        if not x_cells.size or not y_cells.size:
+            return
+        inside = (x_cells[:, None] - pos_x) ** 2 + (y_cells[None, :] - pos_y) ** 2 < radius * radius
+        grid[x_cells[0] : x_cells[-1] + 1, y_cells[0] : y_cells[-1] + 1] += inside * value
+
+    def cell(self, position):
+        """Returns the grid cell of the position, clamped to the map"""
+        width, height = self.pathable.shape
+        return min(max(int(round(position[0])), 0), width - 1), min(max(int(round(position[1])), 0), height - 1)
+
+    def enemy_value(self, unit_type, position):
+        """Enemy army value closer than 20 to the position, weighted against the given unit type of ours"""
+        grid = self.enemy_values.get(unit_type, self.enemy_values[ULTRALISK])
+        return grid[self.cell(position)]
+
+    def force_value(self, position, weights):
+        """Our army value closer than 13 to the position, weights are for zerglings, hydras and ultralisks"""
+        return float(self.own_force[(slice(None), *self.cell(position))] @ np.array(weights))
+
+    def ready_force_value(self, weights):
+        """Value of all our ready army, weights are for zerglings, hydras and ultralisks"""
+        return float(self.ready_army @ np.array(weights))
+
+    def threats_close(self, unit):
+        """Amount of enemies closer than 14 to the unit"""
+        return self.close_threats[self.cell(unit.position)]
+
+    def weapon_threat(self, unit):
+        """Dps of the enemy weapons that reach the unit"""
+        return (self.air if unit.is_flying else self.ground)[self.cell(unit.position)]
+
+    def safest_point(self, unit, preferred, distance=4):
+        """ Cell with the least enemy dps around the unit, ties go to the cell closer to the preferred point,
+         returns None if there is no cell safer than the one the unit is at"""
+        layer = self.air if unit.is_flying else self.ground
+        unit_x, unit_y = self.cell(unit.position)
+        width, height = layer.shape
+        x_start, y_start = max(unit_x - distance, 0), max(unit_y - distance, 0)
+        window = layer[x_start : min(unit_x + distance + 1, width), y_start : min(unit_y + distance + 1, height)]
+        if not unit.is_flying:
+            pathable = self.pathable[x_start : x_start + window.shape[0], y_start : y_start + window.shape[1]]
+            window = np.where(pathable, window, np.inf)
+        x_cells = np.arange(x_start, x_start + window.shape[0])[:, None]
+        y_cells = np.arange(y_start, y_start + window.shape[1])[None, :]
+        tie_breaker = np.sqrt((x_cells - preferred.x) ** 2 + (y_cells - preferred.y) ** 2) * 1e-3
+        best_x, best_y = np.unravel_index(np.argmin(window + tie_breaker), window.shape)
+        if window[best_x, best_y] >= layer[unit_x, unit_y]:
+            return None
+        return Point2((x_start + int(best_x), y_start + int(best_y)))
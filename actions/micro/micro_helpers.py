@@ -1,51 +1,27 @@
 """Every helper for controlling units go here"""
-from sc2.constants import (
-    DISRUPTORPHASED,
-    GUARDIANSHIELDPERSISTENT,
-    LIBERATORTARGETMORPHDELAYPERSISTENT,
-    LIBERATORTARGETMORPHPERSISTENT,
-    SCANNERSWEEP,
-    ULTRALISK,
-)
+from sc2.constants import ULTRALISK
 from sc2.position import Point2
 from sc2.unit import Unit
 
 
-def filter_in_attack_range_of(unit, targets):
-    """filter targets who are in attack range of the unit"""
-    return targets.subgroup(target for target in targets if unit.target_in_range(target))
-
-
 class Micro:
     """Group all helpers, for unit control and targeting here"""
 
+    influence_map = effect_danger = splash_threats = None
+
     def dodge_effects(self, unit: Unit) -> bool:
-        """Dodge any effects"""
-        local_controller = self.controller
-        if not local_controller.state.effects or unit.type_id == ULTRALISK:
+        """Dodge any effects, the escape point comes from the effect grid of the step"""
+        if unit.type_id == ULTRALISK or not self.effect_danger:
             return False
-        excluded_effects = (
-            SCANNERSWEEP,
-            GUARDIANSHIELDPERSISTENT,
-            LIBERATORTARGETMORPHDELAYPERSISTENT,
-            LIBERATORTARGETMORPHPERSISTENT,
-        )  # Placeholder(must find better way to handle some of these)
-        for effect in local_controller.state.effects:
-            if effect.id in excluded_effects:
-                continue
-            danger_zone = local_controller.game_data.effects[effect.id].radius + unit.radius + 0.1
-            if not unit.position.distance_to_point2(unit.position.closest(effect.positions)) < danger_zone:
-                continue
-            perimeter_of_effect = Point2.center(effect.positions).furthest(list(unit.position.neighbors8))
-            local_controller.add_action(unit.move(perimeter_of_effect.towards(unit.position, -1 * danger_zone)))
-            return True
-        return False
+        escape_point = self.effect_danger.escape_point(unit)
+        if not escape_point:
+            return False
+        self.controller.add_action(unit.move(escape_point))
+        return True
 
     def attack_close_target(self, unit, enemies):
         """It targets lowest hp units on its range, if there is any, attack the closest"""
-        targets_close = filter_in_attack_range_of(unit, enemies)
-        if targets_close:
-            self.attack_lowhp(unit, targets_close)
+        if self.attack_lowhp(unit, enemies):
             return True
         if self.attack_in_range(unit):
             return True
@@ -57,36 +33,29 @@ class Micro:
 
     def attack_in_range(self, unit):
         """Attacks the lowest hp enemy in range of the unit"""
-        target_in_range = filter_in_attack_range_of(unit, self.controller.enemies)
-        if target_in_range:
-            self.attack_lowhp(unit, target_in_range)
-            return True
-        return False
+        return self.attack_lowhp(unit, self.controller.enemies)
 
     def move_to_next_target(self, unit, enemies):
         """It helps on the targeting and positioning"""
-        targets_in_range_1 = enemies.closer_than(1, unit)
-        if targets_in_range_1:
-            self.move_lowhp(unit, targets_in_range_1)
+        target = self.controller.targeting.best_target(unit, enemies, 1)
+        if target:
+            self.controller.add_action(unit.move(target))
             return True
         return None
 
     def move_lowhp(self, unit, enemies):
         """Move to enemy with lowest HP"""
-        self.controller.add_action(unit.move(self.closest_lowest_hp(unit, enemies)))
+        self.controller.add_action(unit.move(self.controller.targeting.lowest_hp_target(unit, enemies)))
 
     def attack_lowhp(self, unit, enemies):
-        """Attack enemy with lowest HP"""
-        self.controller.add_action(unit.attack(self.closest_lowest_hp(unit, enemies)))
-
-    def closest_lowest_hp(self, unit, enemies):
-        """Find the closest of the lowest hp enemies"""
-        return self.lowest_hp(enemies).closest_to(unit)
-
-    @staticmethod
-    def lowest_hp(enemies):
-        """returns all of the units who share the lowest hp """
-        return enemies.filter(lambda x: x.health == min(unit.health for unit in enemies))
+        """Attack the enemy in range with lowest HP left, the damage is counted so the next units don't overkill it"""
+        targeting = self.controller.targeting
+        target = targeting.best_target(unit, enemies)
+        if not target:
+            return False
+        targeting.add_damage(unit, target)
+        self.controller.add_action(unit.attack(target))
+        return True
 
     def stutter_step(self, target, unit):
         """Attack when the unit can, run while it can't. We don't outrun the enemy."""
@@ -94,8 +63,7 @@ class Micro:
         if not unit.weapon_cooldown:
             action(unit.attack(target))
             return True
-        retreat_point = self.find_retreat_point(target, unit)
-        action(unit.move(retreat_point))
+        action(unit.move(self.safest_retreat_point(target, unit)))
         return True
 
     def hit_and_run(self, target, unit, range_upgrade=None):
@@ -124,8 +92,7 @@ class Micro:
             return True
         # If our unit is too close, or our weapon is on more than a quarter cooldown, run away.
         if unit.distance_to(target) < minimum_distance or unit.weapon_cooldown > 0.1475 * 22.4:
-            retreat_point = self.find_retreat_point(target, unit)
-            action(unit.move(retreat_point))
+            action(unit.move(self.safest_retreat_point(target, unit)))
             return True
         # If our unit is too far, run towards.
         pursuit_point = self.find_pursuit_point(target, unit)
@@ -145,6 +112,13 @@ class Micro:
         difference = unit.position - target.position
         return Point2((unit.position.x + (difference.x / 2), unit.position.y + (difference.y / 2)))
 
+    def safest_retreat_point(self, target, unit) -> Point2:
+        """Find the cell with less enemy fire close to the unit, if there is none run away from the target"""
+        retreat_point = self.find_retreat_point(target, unit)
+        if self.influence_map:
+            return self.influence_map.safest_point(unit, retreat_point) or retreat_point
+        return retreat_point
+
     @staticmethod
     def trigger_threats(targets, unit, trigger_range):
         """Identify threats based on range"""
@@ -154,11 +128,10 @@ class Micro:
 
     def disruptor_dodge(self, unit):
         """If the enemy has disruptors, run baneling dodging code."""
-        local_controller = self.controller
-        if unit.type_id == ULTRALISK:
+        if unit.type_id == ULTRALISK or not self.splash_threats or not self.splash_threats.balls:
             return False
-        for ball in local_controller.enemies.of_type(DISRUPTORPHASED):
-            if ball.distance_to(unit) < 3:
-                retreat_point = self.find_retreat_point(ball, unit)
-                local_controller.add_action(unit.move(retreat_point))
-                return True
+        ball = self.splash_threats.nearby_ball(unit, 3)
+        if not ball:
+            return False
+        self.controller.add_action(unit.move(self.find_retreat_point(ball, unit)))
+        return True
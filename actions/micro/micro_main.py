@@ -1,5 +1,4 @@
 """Everything related to controlling army units goes here"""
-from sc2 import RACE
 from sc2.constants import (
     ADEPTPHASESHIFT,
     AUTOTURRET,
@@ -21,7 +20,12 @@ from sc2.constants import (
     ZERGLINGATTACKSPEED,
 )
 from actions.micro.army_value_tables import EnemyArmyValue
+from actions.micro.effect_danger import EffectDangerMap
+from actions.micro.influence_map import InfluenceMap
 from actions.micro.micro_helpers import Micro
+from actions.micro.squads import split_in_squads
+from actions.micro.threat_tracker import SplashThreatTracker
+from actions.micro.wall_detection import WallDetection
 from actions.micro.unit.hydralisks import HydraControl
 from actions.micro.unit.zerglings import ZerglingControl
 
@@ -32,9 +36,13 @@ class ArmyControl(ZerglingControl, HydraControl, Micro, EnemyArmyValue):
     def __init__(self, main):
         self.controller = main
         self.retreat_units = set()
-        self.baneling_sacrifices = {}
         self.rally_point = self.action = self.unit_position = self.attack_command = self.bases = None
-        self.static_defence = None
+        self.static_defence = self.squad = None
+        self.squad_cell_size = 8
+        self.influence_map = InfluenceMap(main)
+        self.effect_danger = EffectDangerMap(main)
+        self.splash_threats = SplashThreatTracker(main)
+        self.wall_detection = WallDetection(main)
         self.zergling_atk_speed = self.hydra_move_speed = self.hydra_atk_range = False
 
     async def should_handle(self):
@@ -47,7 +55,7 @@ class ArmyControl(ZerglingControl, HydraControl, Micro, EnemyArmyValue):
             | local_controller.hydras
         )
 
-    async def handle(self):  # needs further refactoring(too-many-branches)
+    async def handle(self):
         """It surrounds and target low hp units, also retreats when overwhelmed,
          it can be improved a lot but is already much better than a-move
         Name army_micro because it is in army.py."""
@@ -55,46 +63,76 @@ class ArmyControl(ZerglingControl, HydraControl, Micro, EnemyArmyValue):
         self.action = local_controller.add_action
         enemy_building = local_controller.enemy_structures
         self.bases = local_controller.townhalls
-        close_targets = close_hydra_targets = None
         self.behavior_changing_upgrades_check()
         targets, atk_force, hydra_targets = self.set_unit_groups()
-        for attacking_unit in atk_force:
-            if self.dodge_effects(attacking_unit):
-                continue
-            if self.disruptor_dodge(attacking_unit):
-                continue
-            self.unit_position = attacking_unit.position
-            self.attack_command = attacking_unit.attack
-            if self.anti_proxy_trigger(attacking_unit):
-                if self.attack_enemy_proxy_units(targets, attacking_unit):
-                    continue
-                self.action(attacking_unit.move(local_controller.spines.closest_to(attacking_unit)))
-                continue
-            if self.anti_terran_bm(attacking_unit):
-                continue
-            if attacking_unit.tag in self.retreat_units and self.bases:
-                self.has_retreated(attacking_unit)
-                continue
-            if self.specific_hydra_behavior(hydra_targets, close_hydra_targets, attacking_unit):
-                continue
-            if await self.specific_zergling_behavior(targets, close_targets, attacking_unit):
-                continue
-            if enemy_building.closer_than(30, self.unit_position):
-                self.action(self.attack_command(enemy_building.closest_to(self.unit_position)))
-                continue
-            if local_controller.time < 1000 and not local_controller.close_enemies_to_base:
-                self.idle_unit(attacking_unit)
-                continue
-            if self.keep_attacking(attacking_unit, targets):
-                continue
-            self.move_to_rallying_point(attacking_unit)
+        self.influence_map.update(self, targets, hydra_targets)
+        self.effect_danger.update()
+        self.splash_threats.update()
+        self.set_rally_point()
+        squads = split_in_squads(atk_force, self.squad_cell_size, targets, hydra_targets, enemy_building)
+        await self.wall_detection.update(self.engagement_pairs(squads))
+        for squad in squads:
+            self.squad = squad
+            self.prepare_targeting(squad, hydra_targets)
+            for attacking_unit in squad.units:
+                self.micro_unit(attacking_unit, targets, hydra_targets)
 
-    def move_to_rallying_point(self, unit):
-        """Set the point where the units should gather"""
+    def prepare_targeting(self, squad, hydra_targets):
+        """Check the ranges of the whole squad at once against the targets its zerglings and hydras pick from"""
+        targeting = self.controller.targeting
+        targeting.prepare(squad.units.of_type(ZERGLING), squad.close_targets)
+        targeting.prepare(squad.units.of_type(HYDRALISK), hydra_targets)
+
+    @staticmethod
+    def engagement_pairs(squads):
+        """Every ground unit that might engage paired with its closest target, so the walls are checked at once"""
+        for squad in squads:
+            if squad.close_targets:
+                for unit in squad.units.not_flying:
+                    yield unit, squad.close_targets.closest_to(unit)
+
+    def micro_unit(self, attacking_unit, targets, hydra_targets):  # needs further refactoring(too-many-branches)
+        """Control one unit of the current squad, the shared decisions come from the squad"""
         local_controller = self.controller
-        map_center = local_controller.game_info.map_center
+        squad = self.squad
+        if self.dodge_effects(attacking_unit):
+            return
+        if self.disruptor_dodge(attacking_unit):
+            return
+        self.unit_position = attacking_unit.position
+        self.attack_command = attacking_unit.attack
+        if self.anti_proxy_trigger(attacking_unit):
+            if self.attack_enemy_proxy_units(targets, attacking_unit):
+                return
+            self.action(attacking_unit.move(local_controller.spines.closest_to(attacking_unit)))
+            return
+        if self.anti_terran_bm(attacking_unit):
+            return
+        if attacking_unit.tag in self.retreat_units and self.bases:
+            self.has_retreated(attacking_unit)
+            return
+        if self.specific_hydra_behavior(hydra_targets, attacking_unit):
+            return
+        if self.specific_zergling_behavior(attacking_unit):
+            return
+        if squad.close_building:
+            self.action(self.attack_command(squad.close_building))
+            return
+        if local_controller.time < 1000 and not local_controller.close_enemies_to_base:
+            self.idle_unit(attacking_unit)
+            return
+        if self.keep_attacking(attacking_unit):
+            return
+        self.move_to_rallying_point(attacking_unit)
+
+    def set_rally_point(self):
+        """Set the point where the units should gather, once per step"""
+        map_center = self.controller.game_info.map_center
         if self.bases.ready:
             self.rally_point = self.bases.ready.closest_to(map_center).position.towards(map_center, 10)
+
+    def move_to_rallying_point(self, unit):
+        """Send the unit to the point where the units should gather"""
         if unit.position.distance_to_point2(self.rally_point) > 5:
             self.controller.add_action(unit.move(self.rally_point))
 
@@ -103,28 +141,29 @@ class ArmyControl(ZerglingControl, HydraControl, Micro, EnemyArmyValue):
         if self.controller.townhalls.closer_than(15, unit.position):
             self.retreat_units.remove(unit.tag)
 
-    def retreat_unit(self, unit, target):
-        """Tell the unit to retreat when overwhelmed"""
-        local_controller = self.controller
-        if local_controller.townhalls.closer_than(10, unit):
-            return False
-        if local_controller.enemy_race == RACE.Zerg:
-            enemy_value = self.enemy_value_zerg(unit, target)
-        elif local_controller.enemy_race == RACE.Terran:
-            enemy_value = self.enemy_value_terran(unit, target)
-        else:
-            enemy_value = self.enemy_value_protoss(unit, target)
-        if (
-            local_controller.townhalls
-            and not local_controller.close_enemies_to_base
-            and not local_controller.structures.closer_than(7, self.unit_position)
-            and enemy_value >= self.battling_force_value(self.unit_position, 1, 5, 13)
-        ):
+    def retreat_unit(self, unit):
+        """Tell the unit to retreat when its squad is overwhelmed"""
+        decisions = self.squad.retreat_decisions
+        if unit.type_id not in decisions:
+            decisions[unit.type_id] = self.squad_should_retreat(unit.type_id)
+        if decisions[unit.type_id]:
             self.move_to_rallying_point(unit)
             self.retreat_units.add(unit.tag)
             return True
         return False
 
+    def squad_should_retreat(self, unit_type):
+        """Decide once per squad and unit type if the units of that type should retreat"""
+        local_controller = self.controller
+        center = self.squad.center
+        return bool(
+            local_controller.townhalls
+            and not local_controller.townhalls.closer_than(10, center)
+            and not local_controller.close_enemies_to_base
+            and not local_controller.structures.closer_than(7, center)
+            and self.influence_map.enemy_value(unit_type, center) >= self.battling_force_value(center, 1, 5, 13)
+        )
+
     def idle_unit(self, unit):
         """Control the idle units, by gathering then or telling then to attack"""
         local_controller = self.controller
@@ -213,11 +252,11 @@ class ArmyControl(ZerglingControl, HydraControl, Micro, EnemyArmyValue):
             return True
         return False
 
-    async def handling_walls_and_attacking(self, unit, target):
+    def handling_walls_and_attacking(self, unit, target):
         """It micros normally if no wall, if there is one attack it"""
         local_controller = self.controller
         closest_target = target.closest_to
-        if await local_controller.client.query_pathing(unit, closest_target(unit).position):
+        if self.wall_detection.reachable(unit, closest_target(unit)):
             if unit.type_id == ZERGLING:
                 return self.micro_zerglings(unit, target)
             self.action(self.attack_command(closest_target(self.unit_position)))
@@ -225,41 +264,37 @@ class ArmyControl(ZerglingControl, HydraControl, Micro, EnemyArmyValue):
         self.action(self.attack_command(local_controller.enemies.not_flying.closest_to(self.unit_position)))
         return True
 
-    def keep_attacking(self, unit, target):
+    def keep_attacking(self, unit):
         """It keeps the attack going if it meets the requirements no matter what"""
         local_controller = self.controller
-        enemy_building = local_controller.enemy_structures
         if not self.retreat_units or local_controller.close_enemies_to_base or local_controller.time >= 1000:
-            if enemy_building:
-                self.action(self.attack_command(enemy_building.closest_to(self.unit_position)))
+            if self.squad.closest_building:
+                self.action(self.attack_command(self.squad.closest_building))
                 return True
-            if target:
-                self.action(self.attack_command(target.closest_to(self.unit_position)))
+            if self.squad.closest_target:
+                self.action(self.attack_command(self.squad.closest_target))
                 return True
             self.attack_startlocation(unit)
             return True
         return False
 
-    def specific_hydra_behavior(self, hydra_targets, close_hydra_targets, unit):
+    def specific_hydra_behavior(self, hydra_targets, unit):
         """Group everything related to hydras behavior on attack"""
-        if hydra_targets:
-            close_hydra_targets = hydra_targets.closer_than(20, self.unit_position)
-        if unit.type_id == HYDRALISK and close_hydra_targets:
-            if self.retreat_unit(unit, close_hydra_targets):
+        if unit.type_id == HYDRALISK and self.squad.close_hydra_targets:
+            if self.retreat_unit(unit):
                 return True
             if self.micro_hydras(hydra_targets, unit):
                 return True
             return False
         return False
 
-    async def specific_zergling_behavior(self, targets, close_targets, unit):
+    def specific_zergling_behavior(self, unit):
         """Group everything related to zergling behavior on attack"""
-        if targets:
-            close_targets = targets.closer_than(20, self.unit_position)
+        close_targets = self.squad.close_targets
         if close_targets:
-            if self.retreat_unit(unit, close_targets):
+            if self.retreat_unit(unit):
                 return True
-            if await self.handling_walls_and_attacking(unit, close_targets):
+            if self.handling_walls_and_attacking(unit, close_targets):
                 return True
             return False
         return False
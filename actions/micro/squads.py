@@ -0,0 +1,34 @@
+"""Everything related to grouping the army in squads goes here"""
+from collections import defaultdict
+from sc2.units import Units
+
+
+class Squad:
+    """ Units of our army that share a grid cell, everything they have in common is found once for all of them,
+     measured from the squad center """
+
+    target_range = 20
+    building_range = 30
+
+    def __init__(self, units, targets, hydra_targets, enemy_building):
+        self.units = units
+        self.center = center = units.center
+        self.close_targets = targets.closer_than(self.target_range, center) if targets else None
+        self.close_hydra_targets = hydra_targets.closer_than(self.target_range, center) if hydra_targets else None
+        self.closest_target = targets.closest_to(center) if targets else None
+        self.closest_building = enemy_building.closest_to(center) if enemy_building else None
+        self.close_building = None
+        if self.closest_building and self.closest_building.distance_to(center) < self.building_range:
+            self.close_building = self.closest_building
+        self.retreat_decisions = {}
+
+
+def split_in_squads(atk_force, cell_size, targets, hydra_targets, enemy_building):
+    """Group the army by grid cell, every cell with units is one squad"""
+    cells = defaultdict(list)
+    for unit in atk_force:
+        position = unit.position
+        cells[int(position.x // cell_size), int(position.y // cell_size)].append(unit)
+    return [
+        Squad(Units(units, atk_force.game_data), targets, hydra_targets, enemy_building) for units in cells.values()
+    ]
@@ -0,0 +1,88 @@
+"""Everything related to choosing what the army shoots goes here"""
+import numpy as np
+
+
+class TargetingEngine:
+    """ Health plus shield, position, radius and flying state of the enemies are turned into arrays once per step and
+     group of targets, so picking the target of each attacker is a few vectorized masks, the damage already sent to a
+     target this step is subtracted from it so the next attackers spread their fire instead of overkilling """
+
+    def __init__(self, main):
+        self.controller = main
+        self.game_loop = None
+        self.slots, self.selections, self.in_range = {}, {}, {}
+        self.damage = np.zeros(0)
+
+    def update(self):
+        """Forget the arrays and the damage of the last step"""
+        game_loop = self.controller.state.game_loop
+        if self.game_loop == game_loop:
+            return
+        self.game_loop = game_loop
+        self.slots, self.selections, self.in_range = {}, {}, {}
+        self.damage = np.zeros(0)
+
+    def selection(self, enemies):
+        """The arrays of a group of enemies, built on the first use of the group in the step"""
+        self.update()
+        cached = self.selections.get(id(enemies))
+        if cached is None:
+            slots = np.array([self.slots.setdefault(enemy.tag, len(self.slots)) for enemy in enemies], dtype=int)
+            if len(self.slots) > len(self.damage):
+                self.damage = np.concatenate((self.damage, np.zeros(len(self.slots) - len(self.damage))))
+            cached = self.selections[id(enemies)] = (
+                enemies,  # keeps the group alive so its id can't be reused in the step
+                slots,
+                np.array([enemy.position for enemy in enemies], dtype=float).reshape(-1, 2),
+                np.array([enemy.health + enemy.shield for enemy in enemies], dtype=float),
+                np.array([enemy.radius for enemy in enemies], dtype=float),
+                np.array([enemy.is_flying for enemy in enemies], dtype=bool),
+            )
+        return cached
+
+    def prepare(self, attackers, enemies):
+        """ Check the range of a whole group of attackers against the enemies with one matrix, best_target then
+         reads the row of each attacker instead of checking its range again """
+        if not attackers or not enemies:
+            return
+        enemies = self.selection(enemies)[0]
+        matrix = self.controller.game_data.weapons.in_range_matrix(attackers, enemies)
+        self.in_range.setdefault(id(enemies), {}).update(zip((unit.tag for unit in attackers), matrix))
+
+    @staticmethod
+    def attack_ranges(unit, flying):
+        """The range of the unit against every enemy, -1 if it can't hit it"""
+        stats = unit.weapon_stats
+        return np.where(flying, stats.air_range, stats.ground_range)
+
+    def best_target(self, unit, enemies, distance=None):
+        """ The enemy in range of the unit, or closer than the distance if one is given, with the lowest effective
+         hp left then the closest, the ones that already got enough damage this step are only picked as last resort """
+        enemies, slots, positions, hp, radius, flying = self.selection(enemies)
+        if not slots.size:
+            return None
+        distances = np.hypot(positions[:, 0] - unit.position.x, positions[:, 1] - unit.position.y)
+        if distance is None:
+            mask = self.in_range.get(id(enemies), {}).get(unit.tag)
+            if mask is None:
+                mask = distances <= unit.radius + radius + self.attack_ranges(unit, flying)
+        else:
+            mask = distances < distance
+        if not mask.any():
+            return None
+        hp_left = hp - self.damage[slots]
+        alive = mask & (hp_left > 0)
+        candidates = np.flatnonzero(alive if alive.any() else mask)
+        best = candidates[np.lexsort((distances[candidates], hp_left[candidates]))[0]]
+        return enemies[int(best)]
+
+    def lowest_hp_target(self, unit, enemies):
+        """The enemy with the lowest effective hp left then the closest, no matter the range"""
+        return self.best_target(unit, enemies, np.inf)
+
+    def add_damage(self, unit, target):
+        """Count the damage of one attack of the unit on the target, so the next attackers can pick another one"""
+        stats = unit.weapon_stats
+        slot = self.slots.get(target.tag)
+        if slot is not None:
+            self.damage[slot] += stats.air_damage if target.is_flying else stats.ground_damage
@@ -0,0 +1,84 @@
+"""Everything related to tracking the enemy splash threats goes here"""
+from sc2.constants import BANELING, DISRUPTORPHASED
+
+
+class SplashThreatTracker:
+    """ Banelings and disruptor balls bucketed on a coarse grid once per step, so a unit only looks at the cells
+     around it, and the zerglings sacrificed to trigger a baneling are kept by tag across steps """
+
+    cell_size = 5
+
+    def __init__(self, main):
+        self.controller = main
+        self.banelings, self.balls = {}, {}
+        self.sacrifices, self.triggered = {}, {}
+
+    def update(self):
+        """Bucket the threats of the step and drop the sacrifices whose zergling or baneling died"""
+        local_controller = self.controller
+        enemies = local_controller.enemies
+        self.banelings = self.bucket(enemies.of_type(BANELING))
+        self.balls = self.bucket(enemies.of_type(DISRUPTORPHASED))
+        baneling_tags = {baneling.tag for cell in self.banelings.values() for baneling in cell}
+        for zergling_tag in self.sacrifices.keys() - local_controller.zerglings.tags:
+            self.release(zergling_tag)
+        for baneling_tag in self.triggered.keys() - baneling_tags:
+            for zergling_tag in self.triggered.pop(baneling_tag):
+                del self.sacrifices[zergling_tag]
+
+    def bucket(self, threats):
+        """Group the threats by grid cell"""
+        cells = {}
+        for threat in threats:
+            cells.setdefault(self.cell(threat.position), []).append(threat)
+        return cells
+
+    def cell(self, position):
+        """The grid cell of the position"""
+        return int(position[0] // self.cell_size), int(position[1] // self.cell_size)
+
+    def nearby(self, cells, unit, radius):
+        """The threats closer than the radius to the unit, the closest first, the radius can't be over the cell size"""
+        if not cells:
+            return []
+        cell_x, cell_y = self.cell(unit.position)
+        close = [
+            (threat.distance_to(unit), threat)
+            for x in (cell_x - 1, cell_x, cell_x + 1)
+            for y in (cell_y - 1, cell_y, cell_y + 1)
+            for threat in cells.get((x, y), ())
+        ]
+        return [threat for distance, threat in sorted(close, key=lambda pair: pair[0]) if distance < radius]
+
+    def nearby_banelings(self, unit, radius=5):
+        """Banelings closer than the radius to the unit, the closest first"""
+        return self.nearby(self.banelings, unit, radius)
+
+    def nearby_ball(self, unit, radius=3):
+        """The closest disruptor ball closer than the radius to the unit, None if there is none"""
+        balls = self.nearby(self.balls, unit, radius)
+        return balls[0] if balls else None
+
+    def assign(self, zergling, baneling):
+        """The zergling is sacrificed to trigger the baneling, more than one zergling can go for the same baneling"""
+        self.release(zergling.tag)
+        self.sacrifices[zergling.tag] = baneling.tag
+        self.triggered.setdefault(baneling.tag, set()).add(zergling.tag)
+
+    def release(self, zergling_tag):
+        """The zergling is not going for its baneling anymore"""
+        baneling_tag = self.sacrifices.pop(zergling_tag, None)
+        if baneling_tag is None:
+            return
+        sacrifices = self.triggered[baneling_tag]
+        sacrifices.discard(zergling_tag)
+        if not sacrifices:
+            del self.triggered[baneling_tag]
+
+    def is_triggered(self, baneling):
+        """If a zergling was already sent to trigger the baneling"""
+        return baneling.tag in self.triggered
+
+    def is_sacrifice_of(self, zergling, baneling):
+        """If the zergling is the one sent to trigger the baneling"""
+        return self.sacrifices.get(zergling.tag) == baneling.tag
@@ -9,6 +9,8 @@ class HydraControl(Micro):
 
     def micro_hydras(self, targets, unit):
         """Control the hydras"""
+        if not self.influence_map.threats_close(unit):
+            return self.attack_close_target(unit, targets)
         our_movespeed, our_range = self.hydra_modifiers(unit)
         threats = self.trigger_threats(targets, unit, 14)
         # Find the closest threat.
@@ -1,5 +1,4 @@
 """Everything related to controlling hydralisks"""
-from sc2.constants import BANELING
 from actions.micro.micro_helpers import Micro
 
 
@@ -8,7 +7,7 @@ class ZerglingControl(Micro):
 
     def micro_zerglings(self, unit, targets):
         """Target low hp units smartly, and surrounds when attack cd is down"""
-        if self.baneling_dodge(unit, targets):
+        if self.baneling_dodge(unit):
             return True
         if self.zergling_modifiers(unit, targets):
             return True
@@ -17,30 +16,27 @@ class ZerglingControl(Micro):
         self.controller.add_action(unit.attack(targets.closest_to(unit.position)))
         return True
 
-    def baneling_dodge(self, unit, targets):
+    def baneling_dodge(self, unit):
         """If the enemy has banelings, run baneling dodging code."""
-        local_controller = self.controller
-        action = local_controller.add_action
-        self.handling_anti_banelings_group()
-        if local_controller.enemies.of_type(BANELING):
-            banelings = self.baneling_group(unit, targets)
-            for baneling in banelings:
-                # Check for close banelings and if we've triggered any banelings
-                if baneling.distance_to(unit) < 4 and self.baneling_sacrifices:
-                    # If we've triggered this specific baneling
-                    if baneling in self.baneling_sacrifices.values():
-                        # And this zergling is targeting it, attack it
-                        if unit in self.baneling_sacrifices and baneling == self.baneling_sacrifices[unit]:
-                            action(unit.attack(baneling))
-                            return True
-                        # Otherwise, run from it.
-                        retreat_point = self.find_retreat_point(baneling, unit)
-                        action(unit.move(retreat_point))
-                        return True
-                    # If this baneling is not targeted yet, trigger it.
-                    return self.baneling_trigger(unit, baneling)
-                return self.baneling_trigger(unit, baneling)
-        return False
+        splash_threats = self.splash_threats
+        if not splash_threats or not splash_threats.banelings:
+            return False
+        banelings = splash_threats.nearby_banelings(unit, 5)
+        if not banelings:
+            return False
+        baneling = banelings[0]
+        # Check for close banelings and if we've triggered any banelings
+        if baneling.distance_to(unit) < 4 and splash_threats.sacrifices and splash_threats.is_triggered(baneling):
+            action = self.controller.add_action
+            # And this zergling is targeting it, attack it
+            if splash_threats.is_sacrifice_of(unit, baneling):
+                action(unit.attack(baneling))
+                return True
+            # Otherwise, run from it.
+            action(unit.move(self.find_retreat_point(baneling, unit)))
+            return True
+        # If this baneling is not targeted yet, trigger it.
+        return self.baneling_trigger(unit, baneling)
 
     def zergling_modifiers(self, unit, targets):
         """Group modifiers for zerglings"""
@@ -52,26 +48,8 @@ class ZerglingControl(Micro):
             return self.attack_close_target(unit, targets)
         return False
 
-    def baneling_group(self, unit, targets):
-        """Put the banelings on one group"""
-        threats = self.trigger_threats(targets, unit, 5)
-        # Check for banelings
-        for threat in threats:
-            if threat.type_id == BANELING:
-                yield threat
-
-    def handling_anti_banelings_group(self):
-        """If the sacrificial zergling dies before the missions is over remove him from the group"""
-        local_controller = self.controller
-        for zergling in list(self.baneling_sacrifices):
-            if (
-                zergling not in local_controller.units()
-                or self.baneling_sacrifices[zergling] not in local_controller.enemies
-            ):
-                del self.baneling_sacrifices[zergling]
-
     def baneling_trigger(self, unit, baneling):
         """If we haven't triggered any banelings, trigger it."""
-        self.baneling_sacrifices[unit] = baneling
+        self.splash_threats.assign(unit, baneling)
         self.controller.add_action(unit.attack(baneling))
         return True
@@ -0,0 +1,133 @@
+"""Everything related to finding out if the army can walk to its targets goes here"""
+from collections import deque
+import math
+import numpy as np
+
+
+def pathable_regions(pathable):
+    """ Label every pathable cell with the id of the region it belongs to, cells that are not pathable are 0,
+     two cells with different ids can't reach each other """
+    regions = np.zeros(pathable.shape, dtype=int)
+    width, height = pathable.shape
+    region_id = 0
+    for start in zip(*np.nonzero(pathable)):
+        if regions[start]:
+            continue
+        region_id += 1
+        regions[start] = region_id
+        queue = deque([start])
+        while queue:
+            cell_x, cell_y = queue.popleft()
+            for step_x, step_y in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                next_x, next_y = cell_x + step_x, cell_y + step_y
+                if 0 <= next_x < width and 0 <= next_y < height:
+                    if pathable[next_x, next_y] and not regions[next_x, next_y]:
+                        regions[next_x, next_y] = region_id
+                        queue.append((next_x, next_y))
+    return regions
+
+
+def merge_regions(regions, opened):
+    """ Label the cells that became pathable, every region they touch becomes one region with them,
+     returns a new grid of labels """
+    regions = regions.copy()
+    width, height = regions.shape
+    for start in zip(*np.nonzero(opened)):
+        if regions[start]:
+            continue
+        regions[start] = -1
+        component, touched = [start], set()
+        queue = deque([start])
+        while queue:
+            cell_x, cell_y = queue.popleft()
+            for step_x, step_y in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                next_x, next_y = cell_x + step_x, cell_y + step_y
+                if 0 <= next_x < width and 0 <= next_y < height:
+                    if opened[next_x, next_y] and not regions[next_x, next_y]:
+                        regions[next_x, next_y] = -1
+                        component.append((next_x, next_y))
+                        queue.append((next_x, next_y))
+                    elif regions[next_x, next_y] > 0:
+                        touched.add(regions[next_x, next_y])
+        region_id = min(touched) if touched else regions.max() + 1
+        regions[tuple(np.transpose(component))] = region_id
+        if touched:
+            regions[np.isin(regions, list(touched))] = region_id
+    return regions
+
+
+class WallDetection:
+    """ Answers if our ground units can walk to their targets, all questions of the step go to the server
+     in one batch and the answers are kept by (unit cell, target cell) for a few game loops """
+
+    cache_loops = 16
+    search_limit = 600
+
+    def __init__(self, main):
+        self.controller = main
+        self.regions = self.terrain = None
+        self.answers = {}
+        self.queries_sent = 0
+
+    def cell(self, position):
+        """Returns the grid cell of the position, clamped to the map"""
+        width, height = self.regions.shape
+        return min(max(int(position.x), 0), width - 1), min(max(int(position.y), 0), height - 1)
+
+    def key(self, unit, target):
+        """Cache key of the pair"""
+        return self.cell(unit.position), self.cell(target.position)
+
+    def local_answer(self, unit, target):
+        """ Answer from the map alone when it's possible, units that touch their target can reach it
+         and units in a different region than the target can't, if the region is the same a short path search
+         around the known structures decides, returns None when only the server knows """
+        if unit.distance_to(target) <= unit.radius + target.radius + 1:
+            return True
+        unit_region, target_region = self.regions[self.cell(unit.position)], self.regions[self.cell(target.position)]
+        if unit_region and target_region and unit_region != target_region:
+            return False
+        distance = self.controller.pathfinder.ground_distance(unit.position, target.position, self.search_limit)
+        if distance is None:
+            return None
+        return distance < math.inf
+
+    def update_regions(self, terrain):
+        """ Label the regions again when the terrain changed, rocks and resources that are gone only join regions
+         so the labels are merged, anything else labels the whole map again """
+        if terrain is self.terrain:
+            return
+        if self.regions is None or (self.terrain & ~terrain).any():
+            self.regions = pathable_regions(terrain)
+        else:
+            self.regions = merge_regions(self.regions, terrain & ~self.terrain)
+        self.terrain = terrain
+
+    async def update(self, pairs):
+        """Answer all (unit, target) pairs of the step, the ones that can't be answered locally in one query"""
+        local_controller = self.controller
+        game_loop = local_controller.state.game_loop
+        self.update_regions(local_controller.pathfinder.terrain)
+        self.answers = {key: answer for key, answer in self.answers.items() if game_loop - answer[1] < self.cache_loops}
+        queries = {}
+        for unit, target in pairs:
+            key = self.key(unit, target)
+            if key in self.answers or key in queries:
+                continue
+            answer = self.local_answer(unit, target)
+            if answer is None:
+                queries[key] = [unit, target.position]
+            else:
+                self.answers[key] = answer, game_loop
+        self.queries_sent = len(queries)
+        if queries:
+            distances = await local_controller.client.query_pathings(list(queries.values()))
+            for key, distance in zip(queries, distances):
+                self.answers[key] = distance > 0, game_loop
+
+    def reachable(self, unit, target):
+        """If the unit can walk to the target, pairs not asked on update are answered locally or assumed reachable"""
+        answer = self.answers.get(self.key(unit, target))
+        if answer:
+            return answer[0]
+        return self.local_answer(unit, target) is not False
@@ -27,6 +27,5 @@ class TrainHydralisk(BuildHive):
 
     async def handle(self):
         """Execute the action of training hydras"""
-        local_controller = self.controller
-        local_controller.add_action(local_controller.larvae.random.train(HYDRALISK))
+        self.controller.production.request(HYDRALISK)
         return True
@@ -15,6 +15,5 @@ class TrainMutalisk:
 
     async def handle(self):
         """Execute the action of training mutas"""
-        local_controller = self.controller
-        local_controller.add_action(local_controller.larvae.random.train(MUTALISK))
+        self.controller.production.request(MUTALISK)
         return True
@@ -31,6 +31,5 @@ class TrainOverlord:
 
     async def handle(self):
         """Execute the action of training overlords"""
-        local_controller = self.controller
-        local_controller.add_action(local_controller.larvae.random.train(OVERLORD))
+        self.controller.production.request(OVERLORD, priority=1)
         return True
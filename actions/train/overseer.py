@@ -26,14 +26,11 @@ class TrainOverseer:
         overseers = local_controller.overseers | local_controller.units(OVERLORDCOCOON)
         if overseers:
             if selected_ov.distance_to(overseers.closest_to(selected_ov)) > 10:
-                local_controller.actions.append(selected_ov(MORPH_OVERSEER))
+                local_controller.add_action(selected_ov(MORPH_OVERSEER))
         else:
-            local_controller.actions.append(selected_ov(MORPH_OVERSEER))
+            local_controller.add_action(selected_ov(MORPH_OVERSEER))
 
     async def morphing_overlords(self):
-        """Check if there is a overlord morphing looping through all cocoons"""
+        """Check if there is a overlord morphing"""
         local_controller = self.controller
-        for hatch in local_controller.units(OVERLORDCOCOON):
-            if await local_controller.is_morphing(hatch, CANCEL_MORPHOVERSEER):
-                return True
-        return False
+        return await local_controller.is_morphing(local_controller.units(OVERLORDCOCOON), CANCEL_MORPHOVERSEER)
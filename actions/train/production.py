@@ -0,0 +1,43 @@
+"""Everything related to handing out the larvae between the train commands goes here"""
+
+
+class ProductionAllocator:
+    """ The train commands only ask for units, the larvae are handed out once per step by priority,
+     every larva is used once and the resources and supply are reserved as they are given out """
+
+    def __init__(self, main):
+        self.controller = main
+        self.demands = []
+
+    def request(self, unit_type, amount=1, priority=0):
+        """Ask for units to be trained from larvae, higher priority is served first, ties by the order asked"""
+        self.demands.append((-priority, len(self.demands), unit_type, amount))
+
+    def unit_cost(self, unit_type):
+        """Minerals, vespene and supply needed to train the unit, the same the ledger reserves for it"""
+        local_controller = self.controller
+        ability = local_controller.game_data.units[unit_type.value].creation_ability.id
+        minerals, vespene, supply = local_controller.ledger.ability_cost(ability)
+        return minerals, vespene, max(supply, 0)
+
+    def allocate(self):
+        """ Hand a distinct larva to each demand while there are resources and supply for it,
+         the larvae of the same unit type are put together so they go as one command"""
+        local_controller = self.controller
+        demands, self.demands = sorted(self.demands), []
+        ledger = local_controller.ledger
+        larvae = [larva for larva in local_controller.larvae if larva.tag not in ledger.larvae]
+        minerals = local_controller.minerals - ledger.minerals
+        vespene = local_controller.vespene - ledger.vespene
+        supply = local_controller.supply_left - ledger.supply
+        assigned = {}
+        for _, _, unit_type, amount in demands:
+            mineral_cost, vespene_cost, supply_cost = self.unit_cost(unit_type)
+            for _ in range(amount):
+                if not larvae or minerals < mineral_cost or vespene < vespene_cost or supply < supply_cost:
+                    break
+                minerals, vespene, supply = minerals - mineral_cost, vespene - vespene_cost, supply - supply_cost
+                assigned.setdefault(unit_type, []).append(larvae.pop())
+        for unit_type, unit_larvae in assigned.items():
+            for larva in unit_larvae:
+                local_controller.add_action(larva.train(unit_type))
@@ -18,6 +18,5 @@ class TrainUltralisk:
 
     async def handle(self):
         """Execute the action of training ultralisks"""
-        local_controller = self.controller
-        local_controller.add_action(local_controller.larvae.random.train(ULTRALISK))
+        self.controller.production.request(ULTRALISK)
         return True
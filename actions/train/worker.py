@@ -1,5 +1,4 @@
 """Everything related to training drones goes here"""
-import numpy as np
 from sc2.constants import DRONE, OVERLORD
 
 
@@ -13,7 +12,6 @@ class TrainWorker:
         """Should this action be handled, needs more smart limitations, its very greedy sometimes"""
         local_controller = self.controller
         workers_total = len(local_controller.workers)
-        geysers = local_controller.extractors
         drones_in_queue = local_controller.already_pending(DRONE)
         if (
             not local_controller.close_enemies_to_base
@@ -27,27 +25,16 @@ class TrainWorker:
                 and len(local_controller.overlords) + local_controller.already_pending(OVERLORD) > 1
             ):
                 return True
-            optimal_workers = min(
-                sum(x.ideal_harvesters for x in local_controller.townhalls | geysers), 90 - len(geysers)
-            )
             return (
-                workers_total + drones_in_queue < optimal_workers
-                and np.sum(
-                    np.array(
-                        [
-                            len(local_controller.zerglings),
-                            len(local_controller.hydras),
-                            len(local_controller.ultralisks),
-                        ]
-                    )
-                    * np.array([1, 2, 3])
-                )
+                workers_total + drones_in_queue < local_controller.economy.optimal_workers
+                and len(local_controller.zerglings)
+                + 2 * len(local_controller.hydras)
+                + 3 * len(local_controller.ultralisks)
                 > 15
             )
         return False
 
     async def handle(self):
         """Execute the action of training drones"""
-        local_controller = self.controller
-        local_controller.add_action(local_controller.larvae.random.train(DRONE))
+        self.controller.production.request(DRONE)
         return True
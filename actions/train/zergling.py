@@ -37,6 +37,5 @@ class TrainZergling(BuildHive):
 
     async def handle(self):
         """Execute the action of training zerglings"""
-        local_controller = self.controller
-        local_controller.add_action(local_controller.larvae.random.train(ZERGLING))
+        self.controller.production.request(ZERGLING)
         return True
@@ -45,8 +45,8 @@ class UpgradeEvochamber:
         if local_controller.hydradens and not self.upgrades_added:
             self.upgrades_added = True
             self.upgrade_list.extend(self.ranged_upgrades)
-        for evo in self.selected_evos:
-            for upgrade in await local_controller.get_available_abilities(evo):
+        for evo, abilities in zip(self.selected_evos, await local_controller.get_cached_abilities(self.selected_evos)):
+            for upgrade in abilities:
                 if upgrade in self.upgrade_list and local_controller.can_afford(upgrade):
                     action(evo(upgrade))
                     return True
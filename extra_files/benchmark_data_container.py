@@ -0,0 +1,107 @@
+"""Micro benchmark of the unit filters DataContainer runs every step, run it from the root folder of the bot"""
+import os
+import random
+import sys
+import timeit
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from s2clientprotocol import data_pb2, raw_pb2, sc2api_pb2
+from data_container import DataContainer
+from sc2.constants import (
+    BARRACKS,
+    COMMANDCENTER,
+    DRONE,
+    EXTRACTOR,
+    HATCHERY,
+    HYDRALISK,
+    LAIR,
+    LARVA,
+    MARINE,
+    MEDIVAC,
+    OVERLORD,
+    QUEEN,
+    SPAWNINGPOOL,
+    SPINECRAWLER,
+    STALKER,
+    ZERGLING,
+)
+from sc2.game_data import GameData
+from sc2.position import Point2
+from sc2.units import Units
+
+STRUCTURES = {BARRACKS, COMMANDCENTER, EXTRACTOR, HATCHERY, LAIR, SPAWNINGPOOL, SPINECRAWLER}
+LIGHT = {DRONE, ZERGLING, HYDRALISK, LARVA, MARINE}
+FLYING = {OVERLORD, MEDIVAC}
+OWN_UNITS = {DRONE: 60, ZERGLING: 80, HYDRALISK: 30, OVERLORD: 20, QUEEN: 6, LARVA: 9, HATCHERY: 3, LAIR: 1}
+OWN_UNITS.update({EXTRACTOR: 6, SPAWNINGPOOL: 1, SPINECRAWLER: 4})
+ENEMY_UNITS = {MARINE: 60, STALKER: 20, MEDIVAC: 8, COMMANDCENTER: 3, BARRACKS: 5}
+
+
+def game_data():
+    """Every unit type of the bot with its attributes, a few with weapons and tech aliases"""
+    data = sc2api_pb2.ResponseData()
+    for type_id in set(OWN_UNITS) | set(ENEMY_UNITS):
+        unit_type = data.units.add(unit_id=type_id.value, name=type_id.name.title(), available=True, armor=1)
+        if type_id in STRUCTURES:
+            unit_type.attributes.extend([data_pb2.Structure, data_pb2.Armored])
+        elif type_id in LIGHT:
+            unit_type.attributes.extend([data_pb2.Light, data_pb2.Biological])
+            unit_type.weapons.add(type=data_pb2.Weapon.Ground, range=4, damage=6, attacks=1, speed=0.6)
+        else:
+            unit_type.attributes.append(data_pb2.Armored)
+    next(unit for unit in data.units if unit.unit_id == LAIR.value).tech_alias.append(HATCHERY.value)
+    return GameData(data)
+
+
+def units(counts, alliance, data):
+    """Units of the given types spread on the map"""
+    protos = []
+    for type_id, amount in counts.items():
+        for _ in range(amount):
+            proto = raw_pb2.Unit(unit_type=type_id.value, tag=len(protos) + alliance * 10000, alliance=alliance)
+            proto.pos.x, proto.pos.y = random.uniform(10, 150), random.uniform(10, 150)
+            proto.is_flying = type_id in FLYING
+            proto.build_progress = 1
+            protos.append(proto)
+    return Units.from_proto(protos, data)
+
+
+class Container(DataContainer):
+    """The data container with the parts of the bot it reads"""
+
+    def __init__(self, data):
+        DataContainer.__init__(self)
+        self.units = units(OWN_UNITS, 1, data)
+        self.known_enemy_units = units(ENEMY_UNITS, 4, data)
+        self.known_enemy_structures = self.known_enemy_units.structure
+        self.townhalls = self.units.of_type({HATCHERY, LAIR})
+        self.start_location = Point2((20, 20))
+        self.game_info = SimpleNamespace(map_center=Point2((80, 80)))
+        self.time = 400
+
+
+def main(number=200):
+    """Time every case and print the microseconds per call"""
+    random.seed(0)
+    container = Container(game_data())
+    own, enemies = container.units, container.known_enemy_units
+    cases = {
+        "prepare_data": container.prepare_data,
+        "structure": lambda: own.structure,
+        "not_structure": lambda: own.not_structure,
+        "of_type": lambda: own.of_type({ZERGLING, HYDRALISK}),
+        "ground enemies": lambda: enemies.not_flying.not_structure.exclude_type({DRONE}),
+        "same_tech": lambda: own.same_tech({HATCHERY}),
+        "same_unit": lambda: own.same_unit({HATCHERY}),
+        "light and armored": lambda: own.filter(lambda unit: unit.is_light or unit.is_armored),
+        "movement and sight": lambda: sum(unit.movement_speed + unit.sight_range + unit.armor for unit in own),
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=number, repeat=3))
+        print(f"{name:>20}: {seconds / number * 1e6:10.1f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,40 @@
+"""Micro benchmark of the point operations the bot uses the most, run it from the root folder of the bot"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sc2.position import Point2, Point3
+
+POINT = Point2((10.5, 20.25))
+OTHER = Point2((40.75, 35.5))
+POINT3 = Point3((10.5, 20.25, 11.0))
+POINTS = [Point2((x * 1.5, y * 2.5)) for x in range(10) for y in range(10)]
+
+CASES = {
+    "distance_to": lambda: POINT.distance_to(OTHER),
+    "distance_to_point2": lambda: POINT.distance_to_point2(OTHER),
+    "distance_to 3d": lambda: POINT3.distance_to(OTHER),
+    "towards": lambda: POINT.towards(OTHER, 3),
+    "offset": lambda: POINT.offset(OTHER),
+    "add": lambda: POINT + OTHER,
+    "sub": lambda: POINT - OTHER,
+    "rounded": lambda: POINT.rounded,
+    "eq": lambda: POINT == OTHER,
+    "hash": lambda: hash(POINT),
+    "closest": lambda: POINT.closest(POINTS),
+    "center": lambda: Point2.center(POINTS),
+}
+
+
+def main(number=100000):
+    """Time every case and print the microseconds per call"""
+    for name, case in CASES.items():
+        runs = number // 100 if name in ("closest", "center") else number
+        seconds = min(timeit.repeat(case, number=runs, repeat=3))
+        print(f"{name:>20}: {seconds / runs * 1e6:8.3f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
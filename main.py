@@ -21,8 +21,10 @@ from actions.build.spores import BuildSpores
 from actions.macro.building_positioning import BuildingPositioning
 from actions.macro.cancel_building import Buildings
 from actions.macro.distribute_workers import DistributeWorkers
+from actions.macro.economy import EconomyModel
 from actions.micro.block_expansions import BlockExpansions
 from actions.micro.micro_main import ArmyControl
+from actions.micro.targeting import TargetingEngine
 from actions.micro.unit.drone import Drone
 from actions.micro.unit.overlord import Overlord
 from actions.micro.unit.overseer import Overseer
@@ -31,6 +33,7 @@ from actions.train.hydras import TrainHydralisk
 from actions.train.mutalisk import TrainMutalisk
 from actions.train.overlord import TrainOverlord
 from actions.train.overseer import TrainOverseer
+from actions.train.production import ProductionAllocator
 from actions.train.queen import TrainQueen
 from actions.train.ultralisk import TrainUltralisk
 from actions.train.worker import TrainWorker
@@ -53,11 +56,17 @@ class JackBot(sc2.BotAI, DataContainer, CreepControl, BuildingPositioning, Block
     """It makes periodic attacks with good surrounding and targeting micro, it goes hydras mid-game
      and ultras end-game"""
 
+    ACTION_QUANTIZATION = 0.5
+
     def __init__(self, debug=False):
         CreepControl.__init__(self)
+        BuildingPositioning.__init__(self)
         DataContainer.__init__(self)
         self.debug = debug
-        self.iteration = self.add_action = None
+        self.iteration = None
+        self.economy = EconomyModel(self)
+        self.production = ProductionAllocator(self)
+        self.targeting = TargetingEngine(self)
         self.unit_commands = (
             BlockExpansions(self),
             DefendWorkerRush(self),
@@ -106,7 +115,7 @@ class JackBot(sc2.BotAI, DataContainer, CreepControl, BuildingPositioning, Block
             UpgradeMuscularAugments(self),
             UpgradeUltraliskSpeed(self),
         )
-        self.ordered_expansions, self.building_positions, self.locations, self.actions = [], [], [], []
+        self.ordered_expansions, self.locations, self.actions = [], [], []
 
     def set_game_step(self):
         """It sets the interval of frames that it will take to make the actions, depending of the game situation"""
@@ -121,23 +130,32 @@ class JackBot(sc2.BotAI, DataContainer, CreepControl, BuildingPositioning, Block
             self.client.game_step = 8
 
     async def on_unit_created(self, unit):
-        """Prepares all the building locations near a new expansion"""
+        """Opens the building slots of a new expansion and closes the ones under new structures"""
         if unit.type_id is HATCHERY:
-            await self.prepare_building_positions(unit)
+            self.activate_building_slots(unit)
+        if unit.is_structure:
+            self.occupy_building_slots(unit)
+
+    async def on_unit_destroyed(self, unit_tag):
+        """Frees the building slots of a dead structure"""
+        self.free_building_slots(unit_tag)
 
     async def on_step(self, iteration):
         """Calls used units here, so it just calls it once per loop"""
         self.iteration = iteration
         self.prepare_data()
+        self.economy.update()
         self.set_game_step()
         self.actions = []
-        self.add_action = self.actions.append
         if not iteration:
             self.locations = list(self.expansion_locations.keys())
             self.prepare_expansions()
+            self.plan_building_slots()
+            self.prepare_creep_spread()
             self.split_workers()
         await self.run_commands(self.unit_commands)
         await self.run_commands(self.train_commands)
+        self.production.allocate()
         await self.run_commands(self.build_commands)
         await self.run_commands(self.upgrade_commands)
         if self.actions:
@@ -145,6 +163,11 @@ class JackBot(sc2.BotAI, DataContainer, CreepControl, BuildingPositioning, Block
                 print(self.actions)
             await self.do_actions(self.actions)
 
+    def add_action(self, action):
+        """Queue the action for the end of the step and reserve what it costs right away"""
+        self.reserve(action)
+        self.actions.append(action)
+
     async def run_commands(self, commands):
         """Group all requirements and execution for a class logic"""
         for command in commands:
@@ -155,7 +178,12 @@ class JackBot(sc2.BotAI, DataContainer, CreepControl, BuildingPositioning, Block
 
     def can_train(self, unit_type, requirement=True, larva=True):
         """Global requirements for creating an unit"""
-        return (not larva or self.larvae) and self.can_afford(unit_type) and self.can_feed(unit_type) and requirement
+        return (
+            (not larva or len(self.larvae) > len(self.ledger.larvae))
+            and self.can_afford(unit_type)
+            and self.can_feed(unit_type)
+            and requirement
+        )
 
     def building_requirement(self, unit_type, requirement=True):
         """Global requirements for building every structure"""
@@ -175,10 +203,13 @@ class JackBot(sc2.BotAI, DataContainer, CreepControl, BuildingPositioning, Block
         return not self.already_pending_upgrade(upgrade) and self.can_afford(research) and host_building
 
     def prepare_expansions(self):
-        """Prepare all expansion locations and put it in order based on distance"""
+        """Prepare all expansion locations and put it in order based on ground distance"""
         start = self.start_location
+        self.pathfinder.distance_field("start", [start])
         waypoints = [point for point in list(self.expansion_locations)]
-        waypoints.sort(key=lambda p: (p[0] - start[0]) ** 2 + (p[1] - start[1]) ** 2)
+        waypoints.sort(
+            key=lambda p: (self.pathfinder.field_distance("start", p), (p[0] - start[0]) ** 2 + (p[1] - start[1]) ** 2)
+        )
         self.ordered_expansions = [Point2((p[0], p[1])) for p in waypoints]
 
     def split_workers(self):
@@ -186,6 +217,6 @@ class JackBot(sc2.BotAI, DataContainer, CreepControl, BuildingPositioning, Block
         for drone in self.drones:
             self.add_action(drone.gather(self.state.mineral_field.closest_to(drone)))
 
-    async def is_morphing(self, base, cancel):
-        """Check if there is a lair morphing by checking the available abilities"""
-        return cancel in await self.get_available_abilities(base)
+    async def is_morphing(self, units, cancel):
+        """Check if any of the units is morphing by checking the available abilities, all at once"""
+        return any(cancel in abilities for abilities in await self.get_cached_abilities(units))
@@ -0,0 +1,72 @@
+"""Keeps the available abilities of our units across steps, so the server is asked for all of them at once"""
+import logging
+from typing import Dict, List
+from .ids.ability_id import AbilityId
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AbilityCache(dict):
+    """ Tag-keyed available abilities, an answer is kept until the unit changes type, orders, build state
+     or crosses an energy threshold, or it gets too old. The units asked about recently are refreshed together
+     at the start of every step. Resources are ignored on the query, the callers check what they can afford """
+
+    max_age = 16
+    interest_loops = 64
+    energy_step = 25
+
+    def __init__(self):
+        super().__init__()
+        self.interested: Dict[int, int] = {}
+        self.asked = self.sent = 0
+
+    @classmethod
+    def signature(cls, unit):
+        """What makes an answer stale when it changes"""
+        proto = unit.proto
+        return (
+            proto.unit_type,
+            tuple(order.ability_id for order in proto.orders),
+            int(proto.energy // cls.energy_step),
+            proto.build_progress >= 1,
+        )
+
+    def is_fresh(self, unit, game_loop) -> bool:
+        """If the kept answer can still be used"""
+        entry = self.get(unit.tag)
+        return entry is not None and game_loop - entry[2] < self.max_age and entry[1] == self.signature(unit)
+
+    async def refresh(self, client, units, game_loop):
+        """Ask the server in one query for all the units without a fresh answer"""
+        stale = [unit for unit in units if not self.is_fresh(unit, game_loop)]
+        if not stale:
+            return
+        answers = await client.query_available_abilities(stale, ignore_resource_requirements=True)
+        self.sent += 1
+        for unit, abilities in zip(stale, answers):
+            self[unit.tag] = abilities, self.signature(unit), game_loop
+
+    async def prefetch(self, client, units, game_loop):
+        """ Start of the step, drop the units that died or weren't asked about for a while
+         and refresh the others together, also logs how many queries the last step saved """
+        if self.asked:
+            LOGGER.debug(f"Ability queries: asked {self.asked}, sent {self.sent}, saved {self.asked - self.sent}")
+        self.asked = self.sent = 0
+        alive = {unit.tag: unit for unit in units}
+        self.interested = {
+            tag: loop
+            for tag, loop in self.interested.items()
+            if tag in alive and game_loop - loop < self.interest_loops
+        }
+        for tag in self.keys() - self.interested.keys():
+            del self[tag]
+        if self.interested:
+            await self.refresh(client, [alive[tag] for tag in self.interested], game_loop)
+
+    async def abilities(self, client, units, game_loop) -> List[List[AbilityId]]:
+        """Available abilities of each unit, only the ones without a fresh answer go to the server"""
+        self.asked += len(units)
+        for unit in units:
+            self.interested[unit.tag] = game_loop
+        await self.refresh(client, units, game_loop)
+        return [self[unit.tag][0] for unit in units]
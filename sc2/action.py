@@ -1,15 +1,44 @@
 """Group everything that is needed to initialize actions requirements"""
-from itertools import groupby
 from s2clientprotocol import common_pb2 as common_pb
 from s2clientprotocol import raw_pb2 as raw_pb
+from .ids.ability_id import AbilityId
 from .position import Point2
 from .unit import Unit
 
 
-def combine_actions(action_iter):
-    """Initialize the actions requirements"""
-    for key, items in groupby(action_iter, key=lambda a: a.combining_tuple):
-        ability, target, queue = key
+QUANTIZED_ABILITIES = {AbilityId.MOVE, AbilityId.ATTACK, AbilityId.SCAN_MOVE}
+
+
+def target_key(action, quantize=None):
+    """ What the target of the command is for grouping, the tag of a unit or the point, move and attack points
+     are snapped to the quantization step when one is given """
+    target = action.target
+    if target is None:
+        return None
+    if isinstance(target, Unit):
+        return target.tag
+    if quantize and action.ability in QUANTIZED_ABILITIES:
+        return round(target.x / quantize), round(target.y / quantize)
+    return target.x, target.y
+
+
+def combine_actions(action_iter, quantize=None):
+    """ Initialize the actions requirements, commands with the same ability, target and queue go together wherever
+     they are on the list, a command only joins a group sent after the previous command of its unit
+     so queues keep their order """
+    buckets, key_buckets, unit_last = [], {}, {}
+    for action in action_iter:
+        key = action.ability, target_key(action, quantize), action.queue
+        last = unit_last.get(action.unit.tag, -1)
+        index = next((index for index in key_buckets.get(key, []) if index > last), None)
+        if index is None:
+            index = len(buckets)
+            buckets.append((action.ability, action.queue, []))
+            key_buckets.setdefault(key, []).append(index)
+        buckets[index][2].append(action)
+        unit_last[action.unit.tag] = index
+    for ability, queue, items in buckets:
+        target = items[0].target
         if target is None:
             cmd = raw_pb.ActionRawUnitCommand(
                 ability_id=ability.value, unit_tags=[u.unit.tag for u in items], queue_command=queue
@@ -31,3 +60,35 @@ def combine_actions(action_iter):
         else:
             raise RuntimeError(f"Must target an unit or a point or None, found '{target !r}'")
         yield raw_pb.ActionRaw(unit_command=cmd)
+
+
+def is_current_order(action, game_data, tolerance) -> bool:
+    """If the command is the same as the unit's first order, same ability and target within the tolerance"""
+    orders = action.unit.proto.orders
+    if action.queue or action.target is None or not orders:
+        return False
+    order, ability = orders[0], game_data.abilities.get(action.ability.value)
+    order_ability = game_data.abilities.get(order.ability_id)
+    if not ability or not order_ability or ability.id != order_ability.id:
+        return False
+    if isinstance(action.target, Unit):
+        return order.target_unit_tag == action.target.tag
+    if not order.HasField("target_world_space_pos"):
+        return False
+    position = order.target_world_space_pos
+    return abs(position.x - action.target.x) <= tolerance and abs(position.y - action.target.y) <= tolerance
+
+
+def filter_actions(actions, game_data, tolerance=0.5):
+    """ Keep only the commands that change something, a command that isn't queued replaces the earlier ones
+     of its unit and the first command of a unit is dropped when the unit is already doing it """
+    unit_actions = {}
+    for action in actions:
+        if action.queue and action.unit.tag in unit_actions:
+            unit_actions[action.unit.tag].append(action)
+        else:
+            unit_actions[action.unit.tag] = [action]
+    kept = []
+    for commands in unit_actions.values():
+        kept.extend(commands[1:] if is_current_order(commands[0], game_data, tolerance) else commands)
+    return kept
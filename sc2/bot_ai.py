@@ -2,7 +2,9 @@
 import logging
 import math
 import random
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
+from .ability_cache import AbilityCache
+from .action import filter_actions
 from .cache import property_cache_forever
 from .data import ACTION_RESULT, RACE, RESULT, TARGET, race_gas, race_townhalls, race_worker
 from .ids.ability_id import AbilityId
@@ -11,9 +13,14 @@ from .ids.upgrade_id import UpgradeId
 from .position import Point2, Point3
 from .unit import Unit
 from .unit_command import UnitCommand
+from .unit_registry import UnitRegistry
 from .units import Units
 from .game_data import AbilityData, GameData
 from .game_state import GameState
+from .ledger import ReservationLedger
+from .pathfinder import Pathfinder
+from .placement import PlacementModel
+from .resource_index import ResourceIndex
 
 
 LOGGER = logging.getLogger(__name__)
@@ -23,12 +30,15 @@ class BotAI:
     """Base class for bots."""
 
     EXPANSION_GAP_THRESHOLD = 15
+    ACTION_QUANTIZATION = None
 
     def __init__(self):
         self.enemy_id = self.units = self.workers = self.townhalls = self.geysers = self.minerals = self.vespene = None
         self.supply_used = self.supply_cap = self.supply_left = self._client = self._game_info = self._game_data = None
-        self.player_id = self.race = self._units_previous_map = self.units = self.state = None
+        self.player_id = self.race = self._unit_registry = self._pathfinder = self.units = self.state = None
+        self._placement_model = self._ability_cache = self._resource_index = self._ledger = None
         self.cached_known_enemy_structures = self.cached_known_enemy_units = None
+        self.step_events: Dict[str, int] = {}
 
     @property
     def enemy_race(self) -> RACE:
@@ -51,11 +61,36 @@ class BotAI:
         """Getter for _game_data"""
         return self._game_data
 
+    @property
+    def pathfinder(self) -> Pathfinder:
+        """Getter for _pathfinder"""
+        return self._pathfinder
+
+    @property
+    def placement_model(self) -> PlacementModel:
+        """Getter for _placement_model"""
+        return self._placement_model
+
+    @property
+    def ledger(self) -> ReservationLedger:
+        """Getter for _ledger"""
+        return self._ledger
+
+    @property
+    def resource_index(self) -> ResourceIndex:
+        """Getter for _resource_index"""
+        return self._resource_index
+
     @property
     def client(self):
         """Getter for _client"""
         return self._client
 
+    @property
+    def unit_registry(self) -> UnitRegistry:
+        """Getter for _unit_registry"""
+        return self._unit_registry
+
     @property
     def start_location(self) -> Point2:
         """Position of the starting base"""
@@ -137,6 +172,15 @@ class BotAI:
         """ Returns available abilities of one or more units. """
         return await self._client.query_available_abilities(units, ignore_resource_requirements)
 
+    async def get_cached_abilities(self, units: Union[List[Unit], Units]) -> List[List[AbilityId]]:
+        """ Returns available abilities of the units, reusing the answers of the last steps while they are fresh,
+         resources are ignored """
+        return await self._ability_cache.abilities(self._client, units, self.state.game_loop)
+
+    async def prepare_abilities(self):
+        """Refresh together the abilities of all units that were asked about recently"""
+        await self._ability_cache.prefetch(self._client, self.units, self.state.game_loop)
+
     async def expand_now(
         self, building: UnitTypeId = None, max_distance: Union[int, float] = 10, location: Optional[Point2] = None
     ):
@@ -164,10 +208,14 @@ class BotAI:
         """Find next expansion location. Changed by Matuiss recently, untested"""
         closest = None
         distance = math.inf
+        self._pathfinder.distance_field("start", [self._game_info.player_start_location])
         for exp_loc in self.expansion_locations:
             if any(self.is_near_to_expansion(th, exp_loc) for th in self.townhalls):
                 continue
-            path_distance = await self._client.query_pathing(self._game_info.player_start_location, exp_loc)
+            path_distance = self._pathfinder.field_distance("start", exp_loc)
+            if path_distance == math.inf:
+                # not reachable on the terrain alone, only the server can tell for sure
+                path_distance = await self._client.query_pathing(self._game_info.player_start_location, exp_loc)
             if path_distance is None:
                 continue
             if path_distance < distance:
@@ -237,12 +285,13 @@ class BotAI:
     def can_feed(self, unit_type: UnitTypeId) -> bool:
         """ Checks if you have enough free supply to build the unit """
         required = self._game_data.units[unit_type.value].proto.food_required
-        return required == 0 or self.supply_left >= required
+        return required == 0 or self.supply_left - self._ledger.supply >= required
 
     def can_afford(
         self, item_id: Union[UnitTypeId, UpgradeId, AbilityId], check_supply_cost: bool = True
     ) -> "CanAffordWrapper":
-        """Tests if the player has enough resources to build a unit or cast an ability."""
+        """ Tests if the player has enough resources to build a unit or cast an ability,
+         what the actions queued on this step reserved is already taken out """
         enough_supply = True
         if isinstance(item_id, UnitTypeId):
             cost = self._game_data.calculate_ability_cost(self._game_data.units[item_id.value].creation_ability)
@@ -253,7 +302,11 @@ class BotAI:
         else:
             cost = self._game_data.calculate_ability_cost(item_id)
 
-        return CanAffordWrapper(cost.minerals <= self.minerals, cost.vespene <= self.vespene, enough_supply)
+        return CanAffordWrapper(
+            cost.minerals <= self.minerals - self._ledger.minerals,
+            cost.vespene <= self.vespene - self._ledger.vespene,
+            enough_supply,
+        )
 
     async def can_cast(
         self,
@@ -335,12 +388,8 @@ class BotAI:
             building = self._game_data.units[building.value].creation_ability
         else:
             building = self._game_data.abilities[building.value]
-        if await self.can_place(building, near):
-            return near
-        if max_distance == 0:
-            return None
-        for distance in range(placement_step, max_distance, placement_step):
-            possible_positions = [
+        rings = [[near]] + [
+            [
                 Point2(p).offset(near).to2
                 for p in (
                     [(dx, -distance) for dx in range(-distance, distance + 1, placement_step)]
@@ -349,14 +398,30 @@ class BotAI:
                     + [(distance, dy) for dy in range(-distance, distance + 1, placement_step)]
                 )
             ]
-            res = await self._client.query_building_placement(building, possible_positions)
-            possible = [p for r, p in zip(res, possible_positions) if r == ACTION_RESULT.Success]
-            if not possible:
-                continue
-            if random_alternative:
-                return random.choice(possible)
-            return min(possible, key=lambda p: p.distance_to(near))
-        return None
+            for distance in range(placement_step, max_distance, placement_step)
+        ]
+        indexed = [(index, point) for index, ring in enumerate(rings) for point in ring]
+        fits = self.placement_fits(building, [point for _, point in indexed])
+        candidates = [candidate for candidate, fit in zip(indexed, fits) if fit]
+        if not candidates:
+            return None
+        # the server confirms every point that survived locally in one query, the closest ring with a success wins
+        res = await self._client.query_building_placement(building, [point for _, point in candidates])
+        placed = [(index, point) for (index, point), r in zip(candidates, res) if r == ACTION_RESULT.Success]
+        if not placed:
+            return None
+        possible = [point for index, point in placed if index == placed[0][0]]
+        if random_alternative:
+            return random.choice(possible)
+        return min(possible, key=lambda p: p.distance_to(near))
+
+    def placement_fits(self, building: AbilityData, positions: List[Point2]):
+        """If the building can fit on each position on the known map, creep and structures"""
+        needs_creep = self.race == RACE.Zerg and building.id not in {
+            AbilityId.ZERGBUILD_HATCHERY,
+            AbilityId.ZERGBUILD_EXTRACTOR,
+        }
+        return self._placement_model.fits(positions, building.footprint_radius, needs_creep)
 
     def already_pending_upgrade(self, upgrade_type: UpgradeId) -> Union[int, float]:
         """ Check if an upgrade is being researched
@@ -441,15 +506,28 @@ class BotAI:
             LOGGER.error(f"Error: {possible_action} (action: {action})")
         return possible_action
 
+    def reserve(self, action: UnitCommand):
+        """Reserve the cost, supply and larva of an action that will be sent at the end of the step"""
+        self._ledger.reserve(action)
+
     async def do_actions(self, actions: List[UnitCommand]):
-        """Group all actions then execute all at the 'same' time"""
+        """ Group all actions then execute all at the 'same' time, the costs were reserved when they were queued,
+         the commands that change nothing are dropped and the rejected ones are counted, both are logged """
         if not actions:
             return None
-        for action in actions:
-            cost = self._game_data.calculate_ability_cost(action.ability)
-            self.minerals -= cost.minerals
-            self.vespene -= cost.vespene
-        action_queue = await self._client.actions(actions, game_data=self._game_data)
+        kept = filter_actions(actions, self._game_data)
+        self._ledger.suppressed = len(actions) - len(kept)
+        if self._ledger.suppressed:
+            LOGGER.debug(
+                f"Suppressed commands: {self._ledger.suppressed} of {len(actions)}, "
+                f"{self._ledger.suppressed / len(actions):.0%}"
+            )
+        if not kept:
+            return []
+        action_queue = await self._client.actions(kept, game_data=self._game_data, quantize=self.ACTION_QUANTIZATION)
+        self._ledger.rejected = len(action_queue)
+        if action_queue:
+            LOGGER.debug(f"Rejected commands: {self._ledger.rejected}, {set(action_queue)}")
         return action_queue
 
     async def chat_send(self, message: str):
@@ -492,7 +570,11 @@ class BotAI:
         self._game_data: GameData = game_data
         self.player_id: int = player_id
         self.race: RACE = RACE(self._game_info.player_races[self.player_id])
-        self._units_previous_map: dict = dict()
+        self._unit_registry: UnitRegistry = UnitRegistry(game_data)
+        self._pathfinder: Pathfinder = Pathfinder(game_info)
+        self._placement_model: PlacementModel = PlacementModel(game_info)
+        self._ability_cache: AbilityCache = AbilityCache()
+        self._ledger: ReservationLedger = ReservationLedger(game_data)
         self.units: Units = Units([], game_data)
 
     def prepare_first_step(self):
@@ -500,13 +582,11 @@ class BotAI:
         if self.townhalls:
             self._game_info.player_start_location = self.townhalls.first.position
         self._game_info.map_ramps = self._game_info.find_ramps()
+        self._resource_index: ResourceIndex = ResourceIndex(self.expansion_locations)
 
     def prepare_step(self, state):
         """Set attributes from new state before on_step."""
         self.state: GameState = state
-        self._units_previous_map.clear()
-        for unit in self.units:
-            self._units_previous_map[unit.tag] = unit
         self.units: Units = state.own_units
         self.workers: Units = self.units(race_worker[self.race])
         self.townhalls: Units = self.units(race_townhalls[self.race])
@@ -516,6 +596,13 @@ class BotAI:
         self.supply_used: Union[float, int] = state.common.food_used
         self.supply_cap: Union[float, int] = state.common.food_cap
         self.supply_left: Union[float, int] = self.supply_cap - self.supply_used
+        self._ledger.reset()
+        structures = self.units.structure + state.enemy_units.structure + state.destructables
+        resources = state.mineral_field + state.vespene_geyser
+        self._pathfinder.update(structures, state.destructables + resources)
+        self._placement_model.update(structures + resources, state.creep)
+        if self._resource_index:
+            self._resource_index.update(state.mineral_field)
         # reset cached values
         self.cached_known_enemy_structures = None
         self.cached_known_enemy_units = None
@@ -525,30 +612,30 @@ class BotAI:
         - on_unit_created
         - on_unit_destroyed
         - on_building_construction_complete
+        The registry already diffed the tags, so only the units that changed get a handler call,
+         the amount of events of each kind is kept on step_events
         """
+        self.step_events = {"destroyed": 0, "created": 0, "completed": 0}
         await self._issue_unit_dead_events()
         await self._issue_unit_added_events()
-        for unit in self.units.structure:
-            await self._issue_building_complete_event(unit)
+        await self._issue_building_complete_events()
+        LOGGER.debug("Events on step: %s", self.step_events)
 
     async def _issue_unit_added_events(self):
-        for unit in self.units.not_structure:
-            if unit.tag not in self._units_previous_map:
-                await self.on_unit_created(unit)
-
-    async def _issue_building_complete_event(self, unit):
-        if unit.build_progress < 1:
-            return
-        if unit.tag not in self._units_previous_map:
-            return
-        if self._units_previous_map[unit.tag].build_progress < 1:
-            await self.on_building_construction_complete(unit)
+        for unit in self._unit_registry.created:
+            self.step_events["created"] += 1
+            await self.on_unit_created(unit)
+
+    async def _issue_building_complete_events(self):
+        for unit in self._unit_registry.completed:
+            if unit.is_structure:
+                self.step_events["completed"] += 1
+                await self.on_building_construction_complete(unit)
 
     async def _issue_unit_dead_events(self):
-        event = self.state.observation.raw_data.event
-        if event is not None:
-            for tag in event.dead_units:
-                await self.on_unit_destroyed(tag)
+        for tag in self.state.dead_units:
+            self.step_events["destroyed"] += 1
+            await self.on_unit_destroyed(tag)
 
     async def on_unit_destroyed(self, unit_tag):
         """ Override this in your bot class. """
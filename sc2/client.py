@@ -107,14 +107,15 @@ class Client(Protocol):
         result = await self._execute(game_info=sc_pb.RequestGameInfo())
         return GameInfo(result.game_info)
 
-    async def actions(self, actions, game_data, return_successes=False):
-        """Returns a list of successful actions, or if there is None return the unsuccessful ones"""
+    async def actions(self, actions, game_data, return_successes=False, quantize=None):
+        """ Returns a list of successful actions, or if there is None return the unsuccessful ones,
+         move and attack points are grouped by the quantization step when one is given """
         if not isinstance(actions, list):
-            res = await self.actions([actions], game_data, return_successes)
+            res = await self.actions([actions], game_data, return_successes, quantize)
             if res:
                 return res[0]
             return None
-        actions = combine_actions(actions)
+        actions = combine_actions(actions, quantize)
         res = await self._execute(action=sc_pb.RequestAction(actions=[sc_pb.Action(action_raw=a) for a in actions]))
         res = [ACTION_RESULT(r) for r in res.action.result]
         if return_successes:
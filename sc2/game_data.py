@@ -4,7 +4,9 @@ from functools import lru_cache, reduce
 from typing import List, Optional
 from .constants import ZERGLING
 from .data import ATTRIBUTE, RACE
+from .type_table import UnitTypeTable
 from .unit_command import UnitCommand
+from .weapon_table import WeaponTable
 from .ids.ability_id import AbilityId
 from .ids.unit_typeid import UnitTypeId
 
@@ -26,6 +28,8 @@ class GameData:
         self.units = {u.unit_id: UnitTypeData(self, u) for u in data.units if u.available}
         self.upgrades = {u.upgrade_id: UpgradeData(self, u) for u in data.upgrades}
         self.effects = {e.effect_id: EffectRawData(self, e) for e in data.effects}
+        self.weapons = WeaponTable(self.units)
+        self.unit_types = UnitTypeTable(self.units, self.weapons)
 
     @lru_cache(maxsize=256)
     def calculate_ability_cost(self, ability) -> "Cost":
@@ -131,6 +135,11 @@ class AbilityData:
         """ For Stimpack this returns 'Research Stimpack' """
         return self.proto.friendly_name
 
+    @property
+    def footprint_radius(self) -> float:
+        """Half of the side of the square the building of this ability takes, 0 for non building abilities"""
+        return self.proto.footprint_radius
+
     @property
     def is_free_morph(self) -> bool:
         """If morphing the unit is free it returns True"""
@@ -4,9 +4,10 @@ from .data import ALLIANCE, DISPLAY_TYPE
 from .ids.effect_id import EffectId
 from .ids.upgrade_id import UpgradeId
 from .pixel_map import PixelMap
-from .position import Point2, Point3
+from .position import Point2, Point2Array, Point3
 from .power_source import PsionicMatrix
 from .score import ScoreDetails
+from .unit import Unit
 from .units import Units
 from sc2.constants import UnitTypeId
 
@@ -99,11 +100,16 @@ class EffectData:
         """List all positions that are targets by the effect"""
         return [Point2.from_proto(p) for p in self.proto.pos]
 
+    @property
+    def position_array(self) -> Point2Array:
+        """All positions of the effect in one array"""
+        return Point2Array.from_proto(self.proto.pos)
+
 
 class GameState:
     """Groups most useful info about the game state"""
 
-    def __init__(self, response_observation, game_data):
+    def __init__(self, response_observation, game_data, unit_registry=None):
         self.actions = response_observation.actions
         self.action_errors = response_observation.action_errors
         self.observation = response_observation.observation
@@ -159,13 +165,22 @@ class GameState:
                 elif unit.alliance == 4:
                     enemy.append(unit)
 
-        self.own_units: Units = Units.from_proto(own, game_data)
+        if unit_registry is not None:
+            self.own_units: Units = unit_registry.update(own)
+        else:
+            self.own_units: Units = Units.from_proto(own, game_data)
         self.enemy_units: Units = Units.from_proto(enemy, game_data)
         self.mineral_field: Units = Units.from_proto(minerals, game_data)
         self.vespene_geyser: Units = Units.from_proto(geysers, game_data)
         self.destructables: Units = Units.from_proto(destructables, game_data)
-        self.units: Units = Units.from_proto(visible_units, game_data)
-        self.distance_units: Units = Units.from_proto(own + enemy + minerals + geysers, game_data)
+        # reuse the unit objects created above instead of decoding the same protos again
+        self.distance_units: Units = Units(
+            self.own_units + self.enemy_units + self.mineral_field + self.vespene_geyser, game_data
+        )
+        decoded = {unit.tag: unit for unit in self.distance_units + self.destructables}
+        self.units: Units = Units(
+            (decoded[unit.tag] if unit.tag in decoded else Unit(unit, game_data) for unit in visible_units), game_data
+        )
         self.blips: Set[Blip] = {Blip(unit) for unit in hidden_units}
         self.visibility: PixelMap = PixelMap(self.observation.raw_data.map_state.visibility)
         self.creep: PixelMap = PixelMap(self.observation.raw_data.map_state.creep)
@@ -0,0 +1,42 @@
+"""What the actions queued on the current step already promised"""
+from typing import Dict, Set, Tuple
+from .ids.ability_id import AbilityId
+from .ids.unit_typeid import UnitTypeId
+from .unit_command import UnitCommand
+
+
+class ReservationLedger:
+    """ Every action queued on a step reserves its cost, the supply it takes and the larva it uses,
+     so the checks made later on the same step only see what is left. The supply is kept per ability,
+     the commands dropped and rejected on the last step are counted here too """
+
+    def __init__(self, game_data):
+        self.game_data = game_data
+        self.unit_supply: Dict[AbilityId, float] = {
+            unit.creation_ability.id: unit.proto.food_required * (2 if unit.id == UnitTypeId.ZERGLING else 1)
+            for unit in game_data.units.values()
+            if unit.creation_ability
+        }
+        self.minerals = self.vespene = self.supply = self.rejected = self.suppressed = 0
+        self.larvae: Set[int] = set()
+
+    def reset(self):
+        """New step, nothing is reserved"""
+        self.minerals = self.vespene = self.supply = 0
+        self.larvae = set()
+
+    def ability_cost(self, ability: AbilityId) -> Tuple[int, int, float]:
+        """Minerals, vespene and supply of the unit the ability creates, the costs are cached by the game data"""
+        cost = self.game_data.calculate_ability_cost(ability)
+        return cost.minerals, cost.vespene, self.unit_supply.get(ability, 0)
+
+    def reserve(self, action: UnitCommand):
+        """Keep the cost, supply and larva of the action out of what is available"""
+        minerals, vespene, supply = self.ability_cost(action.ability)
+        self.minerals += minerals
+        self.vespene += vespene
+        if supply:
+            # morphs only take the difference from the supply of the morphing unit
+            self.supply += max(supply - action.unit.type_data.proto.food_required, 0)
+        if action.unit.type_id == UnitTypeId.LARVA:
+            self.larvae.add(action.unit.tag)
@@ -39,7 +39,7 @@ async def play_game_ai(client, player_id, ai, realtime, step_time_limit, game_ti
         if client.game_result:
             ai.on_end(client.game_result[player_id])
             return client.game_result[player_id]
-        game_state = GameState(state.observation, game_data)
+        game_state = GameState(state.observation, game_data, ai.unit_registry)
         if game_time_limit and (game_state.game_loop * 0.725 * (1 / 16)) > game_time_limit:
             ai.on_end(RESULT.Tie)
             return RESULT.Tie
@@ -49,6 +49,7 @@ async def play_game_ai(client, player_id, ai, realtime, step_time_limit, game_ti
         LOGGER.debug(f"Running AI step, realtime={realtime}")
         try:
             await ai.issue_events()
+            await ai.prepare_abilities()
             if realtime:
                 await ai.on_step(iteration)
             else:
@@ -0,0 +1,225 @@
+"""Ground distances and paths computed in process from the pathing grid"""
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from .ids.unit_typeid import UnitTypeId
+from .position import Point2
+
+SQRT2 = math.sqrt(2)
+NEIGHBORS = (
+    (1, 0, 1),
+    (-1, 0, 1),
+    (0, 1, 1),
+    (0, -1, 1),
+    (1, 1, SQRT2),
+    (1, -1, SQRT2),
+    (-1, 1, SQRT2),
+    (-1, -1, SQRT2),
+)
+NOT_BLOCKING = {UnitTypeId.CREEPTUMOR, UnitTypeId.CREEPTUMORBURROWED, UnitTypeId.CREEPTUMORQUEEN}
+Cell = Tuple[int, int]
+
+
+def footprint_half_size(radius) -> float:
+    """Half of the side of the square a structure blocks, taken from its radius(1.81 -> 1.5, 2.75 -> 2.5)"""
+    return math.floor(radius * 2) / 2
+
+
+def footprint_half_sizes(unit) -> Tuple[float, float]:
+    """ Half of the width and of the height of the rectangle the unit blocks, mineral fields are 2x1 and geysers 3x3,
+     the rest are squares taken from their radius """
+    if unit.is_mineral_field:
+        return 1, 0.5
+    if unit.is_vespene_geyser:
+        return 1.5, 1.5
+    half_size = footprint_half_size(unit.radius)
+    return half_size, half_size
+
+
+def footprints_of(units) -> frozenset:
+    """Positions and half sizes of the rectangles blocked by the units, flying ones and creep tumors don't block"""
+    return frozenset(
+        (unit.position, footprint_half_sizes(unit))
+        for unit in units
+        if not unit.is_flying and unit.type_id not in NOT_BLOCKING
+    )
+
+
+def footprint_mask(shape, footprints) -> np.ndarray:
+    """Grid of the given shape with the cells under the footprints set to True"""
+    mask = np.zeros(shape, dtype=bool)
+    for (pos_x, pos_y), (half_x, half_y) in footprints:
+        size_x, size_y = int(half_x * 2), int(half_y * 2)
+        start_x, start_y = math.floor(pos_x - half_x + 0.5), math.floor(pos_y - half_y + 0.5)
+        mask[max(start_x, 0) : max(start_x + size_x, 0), max(start_y, 0) : max(start_y + size_y, 0)] = True
+    return mask
+
+
+def stamp_footprints(grid, footprints) -> np.ndarray:
+    """Returns a copy of the grid with the cells under the footprints set to False"""
+    return grid & ~footprint_mask(grid.shape, footprints)
+
+
+class Pathfinder:
+    """ Local pathing, the terrain comes from the pathing grid and the structures are stamped on top of it
+     every time they change. The pathing grid of the game start has the rocks and resources on it, so the cells
+     of the ones that are destroyed or mined out are opened on the terrain. Distance fields are computed once on
+     the terrain they were asked on, paths are searched with A* on the terrain with the structures and cached
+     until the structures or the terrain change """
+
+    search_limit = 4000
+    snap_distance = 4
+
+    def __init__(self, game_info):
+        self.start_terrain = self.terrain = game_info.pathing_grid.as_array() == 0
+        self.pathable = self.terrain
+        self.footprints = frozenset()
+        self.start_blockers = self.blockers = None
+        self.fields: Dict[str, np.ndarray] = {}
+        self.paths: Dict[Tuple[Cell, Cell], Tuple[float, Optional[List[Point2]]]] = {}
+
+    def update(self, structures: Iterable, terrain_blockers: Iterable):
+        """ Open the cells of the rocks and resources that are gone since the game start and stamp the ground
+         structures on the terrain, only when they changed since the last step """
+        blockers = footprints_of(terrain_blockers)
+        if self.start_blockers is None:
+            self.start_blockers = self.blockers = blockers
+        if blockers != self.blockers:
+            self.blockers = blockers
+            shape = self.start_terrain.shape
+            removed = footprint_mask(shape, self.start_blockers - blockers) & ~footprint_mask(shape, blockers)
+            self.terrain = self.start_terrain | removed
+            self.footprints = None
+        footprints = footprints_of(structures)
+        if footprints == self.footprints:
+            return
+        self.footprints = footprints
+        self.pathable = stamp_footprints(self.terrain, footprints)
+        self.paths = {}
+
+    @staticmethod
+    def cell(point) -> Cell:
+        """Returns the grid cell of the point"""
+        return int(point[0]), int(point[1])
+
+    def inside(self, cell) -> bool:
+        """If the cell is on the map"""
+        width, height = self.terrain.shape
+        return 0 <= cell[0] < width and 0 <= cell[1] < height
+
+    def snap(self, grid, point) -> List[Tuple[Cell, float]]:
+        """ Pathable cells closest to the point paired with their distance to it, so points inside structures or
+         on cliffs can still be used as start or goal, returns nothing if none is closer than snap_distance """
+        center = self.cell(point)
+        if self.inside(center) and grid[center]:
+            return [(center, 0)]
+        for distance in range(1, self.snap_distance + 1):
+            cells = [
+                (cell, math.hypot(cell[0] + 0.5 - point[0], cell[1] + 0.5 - point[1]))
+                for cell in (
+                    (center[0] + offset_x, center[1] + offset_y)
+                    for offset_x in range(-distance, distance + 1)
+                    for offset_y in range(-distance, distance + 1)
+                    if max(abs(offset_x), abs(offset_y)) == distance
+                )
+                if self.inside(cell) and grid[cell]
+            ]
+            if cells:
+                return cells
+        return []
+
+    def neighbors(self, grid, cell):
+        """Pathable cells around the cell with the cost to step there, diagonals can't cut corners"""
+        cell_x, cell_y = cell
+        for step_x, step_y, cost in NEIGHBORS:
+            next_cell = cell_x + step_x, cell_y + step_y
+            if not self.inside(next_cell) or not grid[next_cell]:
+                continue
+            if step_x and step_y and not (grid[cell_x + step_x, cell_y] and grid[cell_x, cell_y + step_y]):
+                continue
+            yield next_cell, cost
+
+    def distance_field(self, name, sources: Iterable[Point2]) -> np.ndarray:
+        """ Ground distance from the closest source to every cell, found with a multi-source Dijkstra on the terrain
+         the first time the name is asked for, unreachable cells are inf """
+        if name in self.fields:
+            return self.fields[name]
+        field = np.full(self.terrain.shape, math.inf)
+        heap = []
+        for source in sources:
+            for cell, distance in self.snap(self.terrain, source):
+                if distance < field[cell]:
+                    field[cell] = distance
+                    heap.append((distance, cell))
+        heapq.heapify(heap)
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if distance > field[cell]:
+                continue
+            for next_cell, cost in self.neighbors(self.terrain, cell):
+                if distance + cost < field[next_cell]:
+                    field[next_cell] = distance + cost
+                    heapq.heappush(heap, (distance + cost, next_cell))
+        self.fields[name] = field
+        return field
+
+    def field_distance(self, name, point) -> float:
+        """Read the distance of the point on a field already computed, inf if it can't be reached"""
+        field = self.fields[name]
+        return min((field[cell] + distance for cell, distance in self.snap(self.terrain, point)), default=math.inf)
+
+    def find_path(self, start, goal, limit=None) -> Tuple[Optional[float], Optional[List[Point2]]]:
+        """ A* between the points on the terrain with the structures, cached by cells until the structures change.
+         Returns the length and the cells of the path, inf and None when there is surely no path,
+         None and None when more cells than the limit had to be searched to tell """
+        key = self.cell(start), self.cell(goal)
+        if key in self.paths:
+            return self.paths[key]
+        goals = dict(self.snap(self.pathable, goal))
+        goal_x, goal_y = goal[0], goal[1]
+        known: Dict[Cell, float] = {}
+        came_from: Dict[Cell, Optional[Cell]] = {}
+        heap = []
+        for cell, distance in self.snap(self.pathable, start):
+            known[cell] = distance
+            came_from[cell] = None
+            heapq.heappush(heap, (distance + self.estimate(cell, goal_x, goal_y), distance, cell))
+        result = math.inf, None
+        expanded = 0
+        while heap and goals:
+            _, distance, cell = heapq.heappop(heap)
+            if distance > known[cell]:
+                continue
+            if cell in goals:
+                result = distance + goals[cell], self.rebuild_path(came_from, cell)
+                break
+            expanded += 1
+            if expanded > (limit or self.search_limit):
+                return None, None
+            for next_cell, cost in self.neighbors(self.pathable, cell):
+                if distance + cost < known.get(next_cell, math.inf):
+                    known[next_cell] = distance + cost
+                    came_from[next_cell] = cell
+                    estimate = distance + cost + self.estimate(next_cell, goal_x, goal_y)
+                    heapq.heappush(heap, (estimate, distance + cost, next_cell))
+        self.paths[key] = result
+        return result
+
+    @staticmethod
+    def estimate(cell, goal_x, goal_y) -> float:
+        """A* heuristic, straight line from the cell center to the goal point"""
+        return math.hypot(cell[0] + 0.5 - goal_x, cell[1] + 0.5 - goal_y)
+
+    @staticmethod
+    def rebuild_path(came_from, cell) -> List[Point2]:
+        """Walk back from the goal cell to the start, returns the cell centers from the start"""
+        path = []
+        while cell is not None:
+            path.append(Point2((cell[0] + 0.5, cell[1] + 0.5)))
+            cell = came_from[cell]
+        return path[::-1]
+
+    def ground_distance(self, start, goal, limit=None) -> Optional[float]:
+        """Length of the path between the points, inf if there is no path and None if it's not known"""
+        return self.find_path(start, goal, limit)[0]
@@ -1,5 +1,6 @@
 """Makes a pixelmap and returns is specifications"""
 from typing import Callable, FrozenSet, List, Set
+import numpy as np
 from .position import Point2
 
 
@@ -49,6 +50,12 @@ class PixelMap:
         start = index * self.bytes_per_pixel
         self.data[start : start + self.bytes_per_pixel] = val
 
+    def as_array(self) -> np.ndarray:
+        """ Returns the whole map as a numpy array indexed by [x, y], holding the same values as indexing the map
+         itself, so grids can be built and read with array operations instead of pixel by pixel """
+        pixels = np.frombuffer(self.data, dtype=f"<u{self.bytes_per_pixel}").reshape(self.height, self.width)
+        return pixels[-np.arange(self.height)].T
+
     def is_set(self, pixel):
         """Return True if the pixel have something"""
         return self[pixel]
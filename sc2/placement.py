@@ -0,0 +1,56 @@
+"""Building placement checked in process before asking the server"""
+import math
+from typing import List
+import numpy as np
+from .pathfinder import footprints_of, stamp_footprints
+from .position import Point2
+
+
+class PlacementModel:
+    """ Placement grid of the map with the structures and resources stamped on top of it and the creep of the step,
+     candidates are filtered with array operations so the server only has to confirm the ones that survive.
+     Mineral fields and geysers are stamped with their real footprints and the rest with the square of their radius,
+     so on the known data it only rejects what the server rejects too, rocks that are not square aside,
+     but it can accept what the server rejects """
+
+    def __init__(self, game_info):
+        self.placement = game_info.placement_grid.as_array() != 0
+        self.free = self.placement
+        self.footprints = frozenset()
+        self.creep_map = self.creep = None
+
+    def update(self, blockers, creep_map):
+        """Stamp the structures and resources when they changed, the creep is only read when needed"""
+        footprints = footprints_of(blockers)
+        if footprints != self.footprints:
+            self.footprints = footprints
+            self.free = stamp_footprints(self.placement, footprints)
+        self.creep_map, self.creep = creep_map, None
+
+    def creep_cells(self) -> np.ndarray:
+        """Cells with creep on this step"""
+        if self.creep is None:
+            self.creep = self.creep_map.as_array() != 0
+        return self.creep
+
+    def grid(self, needs_creep) -> np.ndarray:
+        """Cells that can hold part of a building"""
+        if not needs_creep:
+            return self.free
+        return self.free & self.creep_cells()
+
+    def fits(self, points: List[Point2], footprint_radius, needs_creep=False) -> np.ndarray:
+        """If a building of the footprint fits on each point, all at once with a summed area table"""
+        size = math.floor(footprint_radius * 2)
+        if not points or not size:
+            return np.ones(len(points), dtype=bool)
+        grid = self.grid(needs_creep)
+        width, height = grid.shape
+        summed = np.zeros((width + 1, height + 1), dtype=int)
+        summed[1:, 1:] = grid.cumsum(axis=0).cumsum(axis=1)
+        start = np.floor(np.array(points, dtype=float) - footprint_radius + 0.5).astype(int)
+        inside = (start >= 0).all(axis=1) & (start[:, 0] + size <= width) & (start[:, 1] + size <= height)
+        start_x, start_y = np.clip(start[:, 0], 0, width - size), np.clip(start[:, 1], 0, height - size)
+        end_x, end_y = start_x + size, start_y + size
+        free_cells = summed[end_x, end_y] - summed[start_x, end_y] - summed[end_x, start_y] + summed[start_x, start_y]
+        return inside & (free_cells == size * size)
@@ -1,8 +1,9 @@
 """Groups everything related to a position on the map or of an unit"""
 import itertools
 import random
-from math import atan2, cos, hypot, inf, pi, sin
+from math import atan2, cos, hypot, inf, pi, sin, sqrt
 from typing import List, Set, Union
+import numpy as np
 
 FLOAT_DIGITS = 8
 EPSILON = 10 ** (-FLOAT_DIGITS)
@@ -21,7 +22,9 @@ class Pointlike(tuple):
     @property
     def rounded(self) -> "Pointlike":
         """Round every point given"""
-        return self.__class__(round(q) for q in self)
+        if len(self) == 2:
+            return self.__class__((round(self[0]), round(self[1])))
+        return self.__class__([round(q) for q in self])
 
     @property
     def position(self) -> "Pointlike":
@@ -29,12 +32,10 @@ class Pointlike(tuple):
         return self
 
     def return_distance(self, position):
-        """Helper for distance_to"""
-        if self == position:
-            return 0
-        return (
-            sum(self.__class__((b - a) * (b - a) for a, b in itertools.zip_longest(self, position, fillvalue=0))) ** 0.5
-        )
+        """Helper for distance_to, the missing coordinates of the shorter point count as 0"""
+        if len(self) == 2 == len(position):
+            return hypot(position[0] - self[0], position[1] - self[1])
+        return sqrt(sum((b - a) ** 2 for a, b in itertools.zip_longest(self, position, fillvalue=0)))
 
     def distance_to(self, unit_or_pos) -> Union[int, float]:
         """Distance from a unit or point to another point"""
@@ -45,7 +46,7 @@ class Pointlike(tuple):
     def distance_to_point2(self, po2: "Point2") -> Union[int, float]:
         """ Same as the function above, but should be 3-4 times faster because of the dropped asserts and conversions
          and because it doesnt use a loop (itertools or zip). """
-        return ((self[0] - po2[0]) ** 2 + (self[1] - po2[1]) ** 2) ** 0.5
+        return hypot(self[0] - po2[0], self[1] - po2[1])
 
     def distance_squared(self, po2: "Point2") -> Union[int, float]:
         """ Function used to not take the square root as the distances will stay proportionally the same.
@@ -58,10 +59,14 @@ class Pointlike(tuple):
         If you want to sort your units towards a point, use 'units.sorted_by_distance_to(point)' instead. """
         if len(iterator) == 1:
             return iterator[0]
+        if isinstance(iterator, Point2Array):
+            return iterator.sorted_by_distance(self).to_points()
         return sorted(iterator, key=lambda p: self.distance_squared(p.position))
 
     def closest(self, iterator):
         """ This function assumes the 2d distance is meant """
+        if isinstance(iterator, Point2Array):
+            return iterator.closest(self)
         assert iterator
         if len(iterator) == 1:
             return iterator[0]
@@ -78,6 +83,8 @@ class Pointlike(tuple):
 
     def distance_to_closest(self, iterator) -> Union[int, float]:
         """ This function assumes the 2d distance is meant """
+        if isinstance(iterator, Point2Array):
+            return iterator.distance_to_closest(self)
         assert iterator
         closest_distance_squared = inf
         for po2 in iterator:
@@ -90,6 +97,8 @@ class Pointlike(tuple):
 
     def furthest(self, iterator):
         """ This function assumes the 2d distance is meant """
+        if isinstance(iterator, Point2Array):
+            return iterator.furthest(self)
         assert iterator
         if len(iterator) == 1:
             return iterator[0]
@@ -106,6 +115,8 @@ class Pointlike(tuple):
 
     def distance_to_furthest(self, iterator) -> Union[int, float]:
         """ This function assumes the 2d distance is meant """
+        if isinstance(iterator, Point2Array):
+            return iterator.distance_to_furthest(self)
         assert iterator
         furthest_distance_squared = -inf
         for po2 in iterator:
@@ -118,11 +129,13 @@ class Pointlike(tuple):
 
     def offset(self, point) -> "Pointlike":
         """ Returns the offset of the point"""
-        return self.__class__(a + b for a, b in itertools.zip_longest(self, point[: len(self)], fillvalue=0))
+        if len(self) == 2 and len(point) >= 2:
+            return self.__class__((self[0] + point[0], self[1] + point[1]))
+        return self.__class__([a + b for a, b in itertools.zip_longest(self, point[: len(self)], fillvalue=0)])
 
     def unit_axes_towards(self, point):
         """Not sure what it does"""
-        return self.__class__(_sign(b - a) for a, b in itertools.zip_longest(self, point[: len(self)], fillvalue=0))
+        return self.__class__([_sign(b - a) for a, b in itertools.zip_longest(self, point[: len(self)], fillvalue=0)])
 
     def towards(
         self, point, distance: Union[int, float] = 1, limit: bool = False
@@ -131,20 +144,30 @@ class Pointlike(tuple):
         point = point.position
         if self == point:
             return self
+        if len(self) == 2 and len(point) >= 2:
+            delta_x, delta_y = point[0] - self[0], point[1] - self[1]
+            dist = hypot(delta_x, delta_y) if len(point) == 2 else self.distance_to(point)
+            if limit:
+                distance = min(dist, distance)
+            return self.__class__((self[0] + delta_x / dist * distance, self[1] + delta_y / dist * distance))
         dist = self.distance_to(point)
         if limit:
             distance = min(dist, distance)
         return self.__class__(
-            a + (b - a) / dist * distance for a, b in itertools.zip_longest(self, point[: len(self)], fillvalue=0)
+            [a + (b - a) / dist * distance for a, b in itertools.zip_longest(self, point[: len(self)], fillvalue=0)]
         )
 
     def __eq__(self, other):
         if not isinstance(other, tuple):
             return False
+        if len(self) == 2 == len(other):
+            return abs(self[0] - other[0]) < EPSILON and abs(self[1] - other[1]) < EPSILON
         return all(abs(a - b) < EPSILON for a, b in itertools.zip_longest(self, other, fillvalue=0))
 
     def __hash__(self):
-        return hash(tuple(int(c * FLOAT_DIGITS) for c in self))
+        if len(self) == 2:
+            return hash((int(self[0] * FLOAT_DIGITS), int(self[1] * FLOAT_DIGITS)))
+        return hash(tuple([int(c * FLOAT_DIGITS) for c in self]))
 
 
 class Point2(Pointlike):
@@ -249,10 +272,10 @@ class Point2(Pointlike):
         return self.offset(other)
 
     def __sub__(self, other: "Point2") -> "Point2":
-        return self.negative_offset(other)
+        return self.__class__((self[0] - other[0], self[1] - other[1]))
 
     def __neg__(self) -> "Point2":
-        return self.__class__(-a for a in self)
+        return self.__class__([-a for a in self])
 
     def __abs__(self) -> Union[int, float]:
         return hypot(self.x, self.y)
@@ -289,10 +312,10 @@ class Point2(Pointlike):
     @staticmethod
     def center(point_list: Union[Set["Point2"], List["Point2"]]) -> "Point2":
         """ Returns the central point for points in list """
-        total = Point2((0, 0))
-        for point in point_list:
-            total += point
-        return total / len(point_list)
+        if isinstance(point_list, Point2Array):
+            return point_list.center
+        amount = len(point_list)
+        return Point2((sum(point[0] for point in point_list) / amount, sum(point[1] for point in point_list) / amount))
 
 
 class Point3(Point2):
@@ -314,6 +337,96 @@ class Point3(Point2):
         return Point3(self)
 
 
+class Point2Array:
+    """ Many 2d points in one numpy array of shape (n, 2), the distance queries over all of them are vectorized,
+     the helpers of Pointlike and Units take it in place of a list of points """
+
+    __slots__ = ("array",)
+
+    def __init__(self, points=()):
+        if isinstance(points, Point2Array):
+            self.array = points.array
+        elif isinstance(points, np.ndarray):
+            self.array = points.astype(float).reshape(-1, 2)
+        else:
+            self.array = np.array([point.position[:2] for point in points], dtype=float).reshape(-1, 2)
+
+    @classmethod
+    def from_units(cls, units) -> "Point2Array":
+        """Positions of the units, read straight from the protocol"""
+        return cls(np.array([(unit.proto.pos.x, unit.proto.pos.y) for unit in units], dtype=float))
+
+    @classmethod
+    def from_proto(cls, positions) -> "Point2Array":
+        """Points from a list of protocol points"""
+        return cls(np.array([(position.x, position.y) for position in positions], dtype=float))
+
+    def to_points(self) -> List[Point2]:
+        """Back to a list of Point2"""
+        return [Point2(point) for point in self.array.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __iter__(self):
+        return iter(self.to_points())
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Point2(self.array[index].tolist())
+        return Point2Array(self.array[index])
+
+    def __repr__(self):
+        return f"Point2Array({self.array.tolist()})"
+
+    def distances_squared(self, point) -> np.ndarray:
+        """Squared distance from every point to the given one"""
+        point = point.position
+        return (self.array[:, 0] - point[0]) ** 2 + (self.array[:, 1] - point[1]) ** 2
+
+    def distances(self, point) -> np.ndarray:
+        """Distance from every point to the given one"""
+        return np.sqrt(self.distances_squared(point))
+
+    def closest(self, point) -> Point2:
+        """The point that is the closest to the given one"""
+        return self[int(np.argmin(self.distances_squared(point)))]
+
+    def furthest(self, point) -> Point2:
+        """The point that is the furthest from the given one"""
+        return self[int(np.argmax(self.distances_squared(point)))]
+
+    def distance_to_closest(self, point) -> float:
+        """Distance from the given point to the closest one"""
+        return float(np.sqrt(self.distances_squared(point).min()))
+
+    def distance_to_furthest(self, point) -> float:
+        """Distance from the given point to the furthest one"""
+        return float(np.sqrt(self.distances_squared(point).max()))
+
+    def argsort(self, point, reverse=False) -> np.ndarray:
+        """Indexes of the points from the closest to the furthest from the given one"""
+        order = np.argsort(self.distances_squared(point), kind="stable")
+        return order[::-1] if reverse else order
+
+    def sorted_by_distance(self, point, reverse=False) -> "Point2Array":
+        """The points from the closest to the furthest from the given one"""
+        return Point2Array(self.array[self.argsort(point, reverse)])
+
+    def within_radius(self, point, radius) -> np.ndarray:
+        """Mask of the points that are in the radius of the given one"""
+        return self.distances_squared(point) <= radius * radius
+
+    def closer_than(self, radius, point) -> "Point2Array":
+        """The points in the radius of the given one"""
+        return Point2Array(self.array[self.within_radius(point, radius)])
+
+    @property
+    def center(self) -> Point2:
+        """The central point of all of them"""
+        return Point2(self.array.mean(axis=0).tolist())
+
+
 class Size(Point2):
     """Return the width and height of the argument"""
 
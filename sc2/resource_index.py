@@ -0,0 +1,76 @@
+"""Which resources belong to which expansion, built once per game"""
+from typing import Dict, Optional, Set
+import numpy as np
+from .position import Point2
+
+
+class ResourceIndex:
+    """ Maps every expansion location to its mineral and geyser tags and every resource tag back to its expansion,
+     resources never move so only the depleted mineral fields have to be taken out """
+
+    base_distance = 6
+
+    def __init__(self, expansion_locations):
+        self.expansions = list(expansion_locations)
+        self.centers = np.array(self.expansions, dtype=float).reshape(-1, 2)
+        self.minerals: Dict[Point2, Set[int]] = {expansion: set() for expansion in self.expansions}
+        self.geysers: Dict[Point2, Set[int]] = {expansion: set() for expansion in self.expansions}
+        self.resource_expansion: Dict[int, Point2] = {}
+        self.resource_positions: Dict[int, Point2] = {}
+        self.expansion_at_position: Dict[Point2, Optional[Point2]] = {}
+        self.centers_of_resources: Dict[Point2, Optional[Point2]] = {}
+        self.version = 0
+        for expansion, resources in expansion_locations.items():
+            for resource in resources:
+                group = self.geysers if resource.is_vespene_geyser else self.minerals
+                group[expansion].add(resource.tag)
+                self.resource_expansion[resource.tag] = expansion
+                self.resource_positions[resource.tag] = resource.position
+        self.mineral_tags: Set[int] = set().union(*self.minerals.values())
+
+    def update(self, mineral_fields):
+        """Take out the indexed mineral fields that were depleted, fields outside of any expansion are ignored"""
+        depleted = self.mineral_tags - mineral_fields.tags
+        if not depleted:
+            return
+        self.mineral_tags -= depleted
+        for tags in self.minerals.values():
+            tags -= depleted
+        for tag in depleted:
+            del self.resource_expansion[tag]
+        self.centers_of_resources = {}
+        self.version += 1
+
+    def expansion_of(self, tag) -> Optional[Point2]:
+        """The expansion the resource belongs to"""
+        return self.resource_expansion.get(tag)
+
+    def expansion_at(self, position) -> Optional[Point2]:
+        """The expansion a townhall on the position is taking, None if it isn't on any"""
+        position = position.position.to2
+        if position not in self.expansion_at_position:
+            expansion = None
+            if self.expansions:
+                distances = ((self.centers - position) ** 2).sum(axis=1)
+                closest = int(distances.argmin())
+                if distances[closest] <= self.base_distance ** 2:
+                    expansion = self.expansions[closest]
+            self.expansion_at_position[position] = expansion
+        return self.expansion_at_position[position]
+
+    def minerals_of(self, expansion) -> Set[int]:
+        """Tags of the mineral fields left on the expansion"""
+        return self.minerals.get(expansion, set())
+
+    def geysers_of(self, expansion) -> Set[int]:
+        """Tags of the geysers of the expansion"""
+        return self.geysers.get(expansion, set())
+
+    def resources_center(self, expansion) -> Optional[Point2]:
+        """Center of the resources left on the expansion"""
+        if expansion not in self.centers_of_resources:
+            tags = self.minerals_of(expansion) | self.geysers_of(expansion)
+            self.centers_of_resources[expansion] = (
+                Point2.center([self.resource_positions[tag] for tag in tags]) if tags else None
+            )
+        return self.centers_of_resources[expansion]
@@ -0,0 +1,111 @@
+"""The static data of every unit type, built once per game"""
+from typing import Dict, FrozenSet, List, Optional
+from .data import ATTRIBUTE, RACE
+from .ids.unit_typeid import UnitTypeId
+from .weapon_table import NO_WEAPON, WeaponStats
+
+
+class UnitTypeStats:
+    """The data of one unit type that never changes during the game, read from the proto once"""
+
+    __slots__ = (
+        "type_id",
+        "name",
+        "race",
+        "is_structure",
+        "is_light",
+        "is_armored",
+        "is_biological",
+        "is_mechanical",
+        "is_robotic",
+        "is_massive",
+        "is_psionic",
+        "is_mineral_field",
+        "is_vespene_geyser",
+        "cargo_size",
+        "movement_speed",
+        "sight_range",
+        "armor",
+        "tech_alias",
+        "unit_alias",
+        "weapons",
+    )
+
+    def __init__(self, type_id: UnitTypeId, type_data=None, weapons: WeaponStats = NO_WEAPON):
+        self.type_id = type_id
+        self.weapons = weapons
+        proto = type_data.proto if type_data else None
+        attributes = set(proto.attributes) if proto else set()
+        self.name = proto.name if proto else type_id.name
+        self.race = RACE(proto.race) if proto else RACE.NoRace
+        self.is_structure = ATTRIBUTE.Structure.value in attributes
+        self.is_light = ATTRIBUTE.Light.value in attributes
+        self.is_armored = ATTRIBUTE.Armored.value in attributes
+        self.is_biological = ATTRIBUTE.Biological.value in attributes
+        self.is_mechanical = ATTRIBUTE.Mechanical.value in attributes
+        self.is_robotic = ATTRIBUTE.Robotic.value in attributes
+        self.is_massive = ATTRIBUTE.Massive.value in attributes
+        self.is_psionic = ATTRIBUTE.Psionic.value in attributes
+        self.is_mineral_field = bool(proto and proto.has_minerals)
+        self.is_vespene_geyser = bool(proto and proto.has_vespene)
+        self.cargo_size = proto.cargo_size if proto else 0
+        self.movement_speed = proto.movement_speed if proto else 0
+        self.sight_range = proto.sight_range if proto else 0
+        self.armor = proto.armor if proto else 0
+        self.tech_alias: Optional[List[UnitTypeId]] = type_data.tech_alias if type_data else None
+        self.unit_alias: Optional[UnitTypeId] = type_data.unit_alias if type_data else None
+
+    def __repr__(self) -> str:
+        return f"UnitTypeStats({self.name})"
+
+
+class UnitTypeTable:
+    """ Attributes, speed, sight, armor, aliases and weapons of every unit type keyed by the type value, so units read
+     plain slots instead of walking the proto lists on every call """
+
+    def __init__(self, unit_types, weapons):
+        self.stats: Dict[int, UnitTypeStats] = {
+            type_value: UnitTypeStats(type_data.id, type_data, weapons.of(type_value))
+            for type_value, type_data in unit_types.items()
+        }
+        self.same_tech_groups: Dict[FrozenSet[UnitTypeId], FrozenSet[int]] = {}
+        self.same_unit_groups: Dict[FrozenSet[UnitTypeId], FrozenSet[int]] = {}
+
+    def __getitem__(self, type_value: int) -> UnitTypeStats:
+        stats = self.stats.get(type_value)
+        if stats is None:
+            stats = self.stats[type_value] = UnitTypeStats(UnitTypeId(type_value))
+        return stats
+
+    def same_tech_types(self, types) -> FrozenSet[int]:
+        """ The values of every type that has the same tech as one of the types, e.g. Hatchery gives Hatchery, Lair
+         and Hive, computed once per group of types """
+        key = frozenset(types)
+        if key not in self.same_tech_groups:
+            alias_types = set(key)
+            for type_id in key:
+                alias_types.update(self[type_id.value].tech_alias or ())
+            self.same_tech_groups[key] = frozenset(
+                {type_id.value for type_id in alias_types}
+                | {
+                    value
+                    for value, stats in self.stats.items()
+                    if stats.tech_alias and any(same in alias_types for same in stats.tech_alias)
+                }
+            )
+        return self.same_tech_groups[key]
+
+    def same_unit_types(self, types) -> FrozenSet[int]:
+        """ The values of every type that is the same unit as one of the types, e.g. CommandCenter gives
+         CommandCenter and CommandCenterFlying, computed once per group of types """
+        key = frozenset(types)
+        if key not in self.same_unit_groups:
+            alias_types = set(key)
+            for type_id in key:
+                if self[type_id.value].unit_alias:
+                    alias_types.add(self[type_id.value].unit_alias)
+            self.same_unit_groups[key] = frozenset(
+                {type_id.value for type_id in alias_types}
+                | {value for value, stats in self.stats.items() if stats.unit_alias in alias_types}
+            )
+        return self.same_unit_groups[key]
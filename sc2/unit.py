@@ -3,11 +3,13 @@ from typing import List, Optional, Set, Union
 from s2clientprotocol import raw_pb2 as raw_pb
 from sc2.ids.buff_id import BuffId
 from . import unit_command
-from .data import ALLIANCE, ATTRIBUTE, CLOAK_STATE, DISPLAY_TYPE, RACE, TARGET_TYPE, warpgate_abilities
+from .data import ALLIANCE, CLOAK_STATE, DISPLAY_TYPE, RACE, TARGET_TYPE, warpgate_abilities
 from .game_data import GameData, UnitTypeData
 from .ids.ability_id import AbilityId
 from .ids.unit_typeid import UnitTypeId
 from .position import Point2, Point3
+from .type_table import UnitTypeStats
+from .weapon_table import WeaponStats
 
 
 class Unit:
@@ -18,18 +20,31 @@ class Unit:
         assert isinstance(game_data, GameData)
         self.proto = proto_data
         self._game_data = game_data
-        self._weapons = self._ground_weapon = self._air_weapon = None
+        self._weapons = self._ground_weapon = self._air_weapon = self._type_stats = None
+
+    def update(self, proto_data):
+        """Replace the proto with the one from a newer observation, keeping this object alive across steps"""
+        if proto_data.unit_type != self.proto.unit_type:
+            self._weapons = self._ground_weapon = self._air_weapon = self._type_stats = None
+        self.proto = proto_data
 
     @property
     def type_id(self) -> UnitTypeId:
         """Returns the unit id"""
-        return UnitTypeId(self.proto.unit_type)
+        return self.type_stats.type_id
 
     @property
     def type_data(self) -> UnitTypeData:
         """Returns the unit data"""
         return self._game_data.units[self.proto.unit_type]
 
+    @property
+    def type_stats(self) -> UnitTypeStats:
+        """Returns the static data of the unit type, read once per game and kept until the unit morphs"""
+        if self._type_stats is None:
+            self._type_stats = self._game_data.unit_types[self.proto.unit_type]
+        return self._type_stats
+
     @property
     def is_snapshot(self):
         """Checks if the unit was visible on a snapshot"""
@@ -138,71 +153,71 @@ class Unit:
     @property
     def is_structure(self) -> bool:
         """Checks if the unit is a structure"""
-        return ATTRIBUTE.Structure.value in self.type_data.attributes
+        return self.type_stats.is_structure
 
     @property
     def is_light(self) -> bool:
         """Checks if the unit is from the light class"""
-        return ATTRIBUTE.Light.value in self.type_data.attributes
+        return self.type_stats.is_light
 
     @property
     def is_armored(self) -> bool:
         """Checks if the unit is from the armored class"""
-        return ATTRIBUTE.Armored.value in self.type_data.attributes
+        return self.type_stats.is_armored
 
     @property
     def is_biological(self) -> bool:
         """Checks if the unit is from the biological class"""
-        return ATTRIBUTE.Biological.value in self.type_data.attributes
+        return self.type_stats.is_biological
 
     @property
     def is_mechanical(self) -> bool:
         """Checks if the unit is from the mechanical class"""
-        return ATTRIBUTE.Mechanical.value in self.type_data.attributes
+        return self.type_stats.is_mechanical
 
     @property
     def is_robotic(self) -> bool:
         """Checks if the unit is from the robotic class"""
-        return ATTRIBUTE.Robotic.value in self.type_data.attributes
+        return self.type_stats.is_robotic
 
     @property
     def is_massive(self) -> bool:
         """Checks if the unit is from the massive class"""
-        return ATTRIBUTE.Massive.value in self.type_data.attributes
+        return self.type_stats.is_massive
 
     @property
     def is_psionic(self) -> bool:
         """Checks if the unit is from the psionic class"""
-        return ATTRIBUTE.Psionic.value in self.type_data.attributes
+        return self.type_stats.is_psionic
 
     @property
     def is_mineral_field(self) -> bool:
         """Checks if the unit is a mineral field"""
-        return self.type_data.has_minerals
+        return self.type_stats.is_mineral_field
 
     @property
     def is_vespene_geyser(self) -> bool:
         """Checks if the unit is a geyser"""
-        return self.type_data.has_vespene
+        return self.type_stats.is_vespene_geyser
 
     @property
     def tech_alias(self) -> Optional[List[UnitTypeId]]:
         """ Building tech equality, e.g. OrbitalCommand is the same as CommandCenter
         For Hive, this returns [UnitTypeId.Hatchery, UnitTypeId.Lair]
         For SCV, this returns None """
-        return self.type_data.tech_alias
+        return self.type_stats.tech_alias
 
     @property
     def unit_alias(self) -> Optional[UnitTypeId]:
         """ Building type equality, e.g. FlyingOrbitalCommand is the same as OrbitalCommand
         For flying OrbitalCommand, this returns UnitTypeId.OrbitalCommand
         For SCV, this returns None """
-        return self.type_data.unit_alias
+        return self.type_stats.unit_alias
 
     @property
     def race(self) -> RACE:
         """Returns the unit race"""
-        return RACE(self.type_data.proto.race)
+        return self.type_stats.race
 
     @property
     def health(self) -> Union[int, float]:
@@ -299,7 +314,7 @@ class Unit:
     @property
     def cargo_size(self) -> Union[float, int]:
         """ How much cargo this unit uses up in cargo_space """
-        return self.type_data.cargo_size
+        return self.type_stats.cargo_size
 
     @property
     def has_cargo(self) -> bool:
@@ -353,73 +368,63 @@ class Unit:
             return self._air_weapon
         return None
 
+    @property
+    def weapon_stats(self) -> WeaponStats:
+        """Returns the ground and air weapon stats of the unit type, from the table built once per game"""
+        return self.type_stats.weapons
+
     @property
     def can_attack_ground(self) -> bool:
         """Checks if the unit can attack ground"""
-        if hasattr(self.type_data.proto, "weapons"):
-            weapons = self.type_data.proto.weapons
-            weapon = next(
-                (weapon for weapon in weapons if weapon.type in {TARGET_TYPE.Ground.value, TARGET_TYPE.Any.value}), None
-            )
-            return weapon is not None
-        return False
+        return self.weapon_stats.can_attack_ground
 
     @property
     def ground_dps(self) -> Union[int, float]:
         """ Does not include upgrades """
-        if hasattr(self.type_data.proto, "weapons"):
-            weapons = self.type_data.proto.weapons
-            weapon = next(
-                (weapon for weapon in weapons if weapon.type in {TARGET_TYPE.Ground.value, TARGET_TYPE.Any.value}), None
-            )
-            if weapon:
-                return (weapon.damage * weapon.attacks) / weapon.speed
-        return 0
+        return self.weapon_stats.ground_dps
 
     @property
     def ground_range(self) -> Union[int, float]:
         """ Does not include upgrades """
-        return self.ground_weapon and self.ground_weapon.range
+        stats = self.weapon_stats
+        return stats.ground_range if stats.can_attack_ground else 0
 
     @property
     def can_attack_air(self) -> bool:
         """ Does not include upgrades """
-        return self.air_weapon
+        return self.weapon_stats.can_attack_air
 
     @property
     def air_dps(self) -> Union[int, float]:
         """ Does not include upgrades """
-        return self.air_weapon and (self.air_weapon.damage * self.air_weapon.attacks) / self.air_weapon.speed
+        return self.weapon_stats.air_dps
 
     @property
     def air_range(self) -> Union[int, float]:
         """ Does not include upgrades """
-        return self.air_weapon and self.air_weapon.range
+        stats = self.weapon_stats
+        return stats.air_range if stats.can_attack_air else 0
 
     def target_in_range(self, target: "Unit", bonus_distance: Union[int, float] = 0) -> bool:
         """ Includes the target's radius when calculating distance to target """
-        if self.can_attack_ground and not target.is_flying:
-            unit_attack_range = self.ground_range
-        elif self.can_attack_air and target.is_flying and (target.is_flying or target.type_id == UnitTypeId.COLOSSUS):
-            unit_attack_range = self.air_range
-        else:
-            unit_attack_range = -1
+        stats = self.weapon_stats
+        unit_attack_range = stats.air_range if target.is_flying else stats.ground_range
         return self.distance_to(target) + bonus_distance <= self.radius + target.radius + unit_attack_range
 
     @property
     def armor(self) -> Union[int, float]:
         """ Does not include upgrades """
-        return self.type_data.proto.armor
+        return self.type_stats.armor
 
     @property
     def sight_range(self) -> Union[int, float]:
         """Returns the unit sight range"""
-        return self.type_data.proto.sight_range
+        return self.type_stats.sight_range
 
     @property
     def movement_speed(self) -> Union[int, float]:
         """Returns the unit movement speed"""
-        return self.type_data.proto.movement_speed
+        return self.type_stats.movement_speed
 
     @property
     def is_carrying_minerals(self) -> bool:
@@ -561,7 +566,7 @@ class Unit:
     @property
     def name(self) -> str:
         """Returns the unit name"""
-        return self.type_data.name
+        return self.type_stats.name
 
     def train(self, unit, *args, **kwargs):
         """Make the unit train something if it can"""
@@ -669,15 +674,20 @@ class PassengerUnit:
         """Returns unit data"""
         return self._game_data.units[self.proto.unit_type]
 
+    @property
+    def type_stats(self) -> UnitTypeStats:
+        """Returns the static data of the unit type"""
+        return self._game_data.unit_types[self.proto.unit_type]
+
     @property
     def name(self) -> str:
         """Returns unit name"""
-        return self.type_data.name
+        return self.type_stats.name
 
     @property
     def race(self) -> RACE:
         """Returns unit race"""
-        return RACE(self.type_data.proto.race)
+        return self.type_stats.race
 
     @property
     def tag(self) -> int:
@@ -687,127 +697,94 @@ class PassengerUnit:
     @property
     def is_structure(self) -> bool:
         """Checks if the unit is a structure"""
-        return ATTRIBUTE.Structure.value in self.type_data.attributes
+        return self.type_stats.is_structure
 
     @property
     def is_light(self) -> bool:
         """Checks if the unit is from the light class"""
-        return ATTRIBUTE.Light.value in self.type_data.attributes
+        return self.type_stats.is_light
 
     @property
     def is_armored(self) -> bool:
         """Checks if the unit is from the armored class"""
-        return ATTRIBUTE.Armored.value in self.type_data.attributes
+        return self.type_stats.is_armored
 
     @property
     def is_biological(self) -> bool:
         """Checks if the unit is from the biological class"""
-        return ATTRIBUTE.Biological.value in self.type_data.attributes
+        return self.type_stats.is_biological
 
     @property
     def is_mechanical(self) -> bool:
         """Checks if the unit is from the mechanical class"""
-        return ATTRIBUTE.Mechanical.value in self.type_data.attributes
+        return self.type_stats.is_mechanical
 
     @property
     def is_robotic(self) -> bool:
         """Checks if the unit is from the robotic class"""
-        return ATTRIBUTE.Robotic.value in self.type_data.attributes
+        return self.type_stats.is_robotic
 
     @property
     def is_massive(self) -> bool:
         """Checks if the unit is from the massive class"""
-        return ATTRIBUTE.Massive.value in self.type_data.attributes
+        return self.type_stats.is_massive
 
     @property
     def cargo_size(self) -> Union[float, int]:
         """ How much cargo this unit uses up in cargo_space """
-        return self.type_data.cargo_size
+        return self.type_stats.cargo_size
+
+    @property
+    def weapon_stats(self) -> WeaponStats:
+        """Returns the ground and air weapon stats of the unit type, from the table built once per game"""
+        return self.type_stats.weapons
 
     @property
     def can_attack_ground(self) -> bool:
         """Checks if the unit can attack ground"""
-        if hasattr(self.type_data.proto, "weapons"):
-            weapons = self.type_data.proto.weapons
-            weapon = next(
-                (weapon for weapon in weapons if weapon.type in [TARGET_TYPE.Ground.value, TARGET_TYPE.Any.value]), None
-            )
-            return weapon is not None
-        return False
+        return self.weapon_stats.can_attack_ground
 
     @property
     def ground_dps(self) -> Union[int, float]:
         """ Does not include upgrades """
-        if hasattr(self.type_data.proto, "weapons"):
-            weapons = self.type_data.proto.weapons
-            weapon = next(
-                (weapon for weapon in weapons if weapon.type in [TARGET_TYPE.Ground.value, TARGET_TYPE.Any.value]), None
-            )
-            if weapon:
-                return (weapon.damage * weapon.attacks) / weapon.speed
-        return 0
+        return self.weapon_stats.ground_dps
 
     @property
     def ground_range(self) -> Union[int, float]:
         """ Does not include upgrades """
-        if hasattr(self.type_data.proto, "weapons"):
-            weapons = self.type_data.proto.weapons
-            weapon = next(
-                (weapon for weapon in weapons if weapon.type in [TARGET_TYPE.Ground.value, TARGET_TYPE.Any.value]), None
-            )
-            if weapon:
-                return weapon.range
-        return 0
+        stats = self.weapon_stats
+        return stats.ground_range if stats.can_attack_ground else 0
 
     @property
     def can_attack_air(self) -> bool:
         """ Does not include upgrades """
-        if hasattr(self.type_data.proto, "weapons"):
-            weapons = self.type_data.proto.weapons
-            weapon = next(
-                (weapon for weapon in weapons if weapon.type in [TARGET_TYPE.Air.value, TARGET_TYPE.Any.value]), None
-            )
-            return weapon is not None
-        return False
+        return self.weapon_stats.can_attack_air
 
     @property
     def air_dps(self) -> Union[int, float]:
         """ Does not include upgrades """
-        if hasattr(self.type_data.proto, "weapons"):
-            weapons = self.type_data.proto.weapons
-            weapon = next(
-                (weapon for weapon in weapons if weapon.type in [TARGET_TYPE.Air.value, TARGET_TYPE.Any.value]), None
-            )
-            if weapon:
-                return (weapon.damage * weapon.attacks) / weapon.speed
-        return 0
+        return self.weapon_stats.air_dps
 
     @property
     def air_range(self) -> Union[int, float]:
         """ Does not include upgrades """
-        if hasattr(self.type_data.proto, "weapons"):
-            weapons = self.type_data.proto.weapons
-            weapon = next(
-                (weapon for weapon in weapons if weapon.type in [TARGET_TYPE.Air.value, TARGET_TYPE.Any.value]), None
-            )
-            if weapon:
-                return weapon.range
-        return 0
+        stats = self.weapon_stats
+        return stats.air_range if stats.can_attack_air else 0
 
     @property
     def armor(self) -> Union[int, float]:
         """ Does not include upgrades """
-        return self.type_data.proto.armor
+        return self.type_stats.armor
 
     @property
     def sight_range(self) -> Union[int, float]:
         """Returns unit sight range"""
-        return self.type_data.proto.sight_range
+        return self.type_stats.sight_range
 
     @property
     def movement_speed(self) -> Union[int, float]:
         """Returns unit movement speed"""
-        return self.type_data.proto.movement_speed
+        return self.type_stats.movement_speed
 
     @property
     def health(self) -> Union[int, float]:
@@ -0,0 +1,42 @@
+"""Keeps our units alive across steps, so only births and deaths allocate or free Unit objects"""
+from typing import List, Set
+import numpy as np
+from .unit import Unit
+from .units import Units
+
+
+class UnitRegistry(dict):
+    """Tag-keyed collection of our units, updated in place from every new observation"""
+
+    def __init__(self, game_data):
+        super().__init__()
+        self.game_data = game_data
+        self.created: List[Unit] = []
+        self.completed: List[Unit] = []
+        self.destroyed: Set[int] = set()
+
+    def update(self, protos) -> Units:
+        """ Refresh the known units from the new protos, creating entries for new tags and dropping the ones
+         that disappeared, returns the units in the same order as the protos """
+        new_protos = {proto.tag: proto for proto in protos}
+        born = new_protos.keys() - self.keys()
+        vanished = self.keys() - new_protos.keys()
+        kept = list(new_protos.keys() & self.keys())
+        self.completed = self.finished_construction(kept, new_protos)
+        for tag in kept:
+            self[tag].update(new_protos[tag])
+        for tag in vanished:
+            del self[tag]
+        self.created = [
+            self.setdefault(tag, Unit(proto, self.game_data)) for tag, proto in new_protos.items() if tag in born
+        ]
+        self.destroyed = vanished
+        return Units([self[tag] for tag in new_protos], self.game_data)
+
+    def finished_construction(self, tags, new_protos) -> List[Unit]:
+        """Compare the build progress of the units on both steps at once and return the ones that just finished"""
+        if not tags:
+            return []
+        previous = np.fromiter((self[tag].proto.build_progress for tag in tags), float, len(tags))
+        current = np.fromiter((new_protos[tag].build_progress for tag in tags), float, len(tags))
+        return [self[tags[index]] for index in np.flatnonzero((previous < 1) & (current >= 1))]
@@ -81,7 +81,10 @@ class Units(list):
 
     def in_attack_range_of(self, unit: Unit, bonus_distance: Union[int, float] = 0) -> "Units":
         """ Filters units that are in attack range of the unit in parameter """
-        return self.filter(lambda x: unit.target_in_range(x, bonus_distance=bonus_distance))
+        if not self:
+            return self.subgroup([])
+        in_range = self.game_data.weapons.in_range_matrix([unit], self, bonus_distance)[0]
+        return self.subgroup(target for target, reachable in zip(self, in_range) if reachable)
 
     def closest_distance_to(self, position: Union[Unit, Point2, Point3]) -> Union[int, float]:
         """ Returns the distance between the closest unit from this group to the target unit """
@@ -183,17 +186,8 @@ class Units(list):
         """
         if isinstance(other, UnitTypeId):
             other = {other}
-        tech_alias_types = set(other)
-        for unit_type in other:
-            tech_alias = self.game_data.units[unit_type.value].tech_alias
-            if tech_alias:
-                for same in tech_alias:
-                    tech_alias_types.add(same)
-        return self.filter(
-            lambda unit: unit.type_id in tech_alias_types
-            or unit.type_data.tech_alias is not None
-            and any(same in tech_alias_types for same in unit.type_data.tech_alias)
-        )
+        same_tech_types = self.game_data.unit_types.same_tech_types(other)
+        return self.filter(lambda unit: unit.proto.unit_type in same_tech_types)
 
     def same_unit(self, other: Union[UnitTypeId, Set[UnitTypeId], List[UnitTypeId], Dict[UnitTypeId, Any]]) -> "Units":
         """ Usage:
@@ -206,16 +200,8 @@ class Units(list):
         """
         if isinstance(other, UnitTypeId):
             other = {other}
-        unit_alias_types = set(other)
-        for unit_type in other:
-            unit_alias = self.game_data.units[unit_type.value].unit_alias
-            if unit_alias:
-                unit_alias_types.add(unit_alias)
-        return self.filter(
-            lambda unit: unit.type_id in unit_alias_types
-            or unit.type_data.unit_alias is not None
-            and unit.type_data.unit_alias in unit_alias_types
-        )
+        same_unit_types = self.game_data.unit_types.same_unit_types(other)
+        return self.filter(lambda unit: unit.proto.unit_type in same_unit_types)
 
     @property
     def center(self) -> Point2:
@@ -0,0 +1,98 @@
+"""The weapons of every unit type, built once per game"""
+from typing import Dict
+import numpy as np
+from .data import TARGET_TYPE
+
+GROUND_TARGETS = {TARGET_TYPE.Ground.value, TARGET_TYPE.Any.value}
+AIR_TARGETS = {TARGET_TYPE.Air.value, TARGET_TYPE.Any.value}
+
+
+class WeaponStats:
+    """The first ground and air weapon of a unit type, the ranges are -1 when it can't hit that kind of target"""
+
+    __slots__ = (
+        "ground_range",
+        "air_range",
+        "ground_dps",
+        "air_dps",
+        "ground_cooldown",
+        "air_cooldown",
+        "ground_damage",
+        "air_damage",
+    )
+
+    def __init__(self, ground=None, air=None):
+        self.ground_range, self.ground_dps, self.ground_cooldown, self.ground_damage = self.read(ground)
+        self.air_range, self.air_dps, self.air_cooldown, self.air_damage = self.read(air)
+
+    def __repr__(self) -> str:
+        return f"WeaponStats(ground={self.ground_range}, air={self.air_range})"
+
+    @staticmethod
+    def read(weapon):
+        """Range, dps, seconds between attacks and damage of one attack of the weapon"""
+        if not weapon:
+            return -1, 0, 0, 0
+        damage = weapon.damage * weapon.attacks
+        return weapon.range, damage / weapon.speed if weapon.speed else 0, weapon.speed, damage
+
+    @property
+    def can_attack_ground(self) -> bool:
+        """If the type has a weapon that hits ground units"""
+        return self.ground_range >= 0
+
+    @property
+    def can_attack_air(self) -> bool:
+        """If the type has a weapon that hits air units"""
+        return self.air_range >= 0
+
+
+NO_WEAPON = WeaponStats()
+
+
+def weapon_stats(weapons) -> WeaponStats:
+    """Read the first ground and the first air weapon from the weapons of a type"""
+    return WeaponStats(
+        next((weapon for weapon in weapons if weapon.type in GROUND_TARGETS), None),
+        next((weapon for weapon in weapons if weapon.type in AIR_TARGETS), None),
+    )
+
+
+class WeaponTable:
+    """ Ground and air range, dps, cooldown and damage of every unit type, as a dict for single units and as arrays
+     indexed by the position of the type for the checks of whole armies at once, the last row of the arrays has
+     no weapon and is used for the types missing from the game data """
+
+    def __init__(self, unit_types):
+        self.stats: Dict[int, WeaponStats] = {
+            type_id: weapon_stats(type_data.proto.weapons) for type_id, type_data in unit_types.items()
+        }
+        self.index: Dict[int, int] = {type_id: position for position, type_id in enumerate(self.stats)}
+        rows = list(self.stats.values()) + [NO_WEAPON]
+        self.ground_range = np.array([stats.ground_range for stats in rows], dtype=float)
+        self.air_range = np.array([stats.air_range for stats in rows], dtype=float)
+
+    def of(self, type_id) -> WeaponStats:
+        """The weapon stats of the type, the type can be a UnitTypeId or its value"""
+        return self.stats.get(getattr(type_id, "value", type_id), NO_WEAPON)
+
+    def type_indices(self, units) -> np.ndarray:
+        """The position of the type of every unit in the arrays of the table, unknown types get the no weapon row"""
+        no_weapon = len(self.index)
+        return np.array([self.index.get(unit.proto.unit_type, no_weapon) for unit in units], dtype=int)
+
+    def in_range_matrix(self, attackers, targets, bonus_distance=0) -> np.ndarray:
+        """ Boolean matrix with one row per attacker and one column per target, true when the target is in range of
+         the attacker, it matches Unit.target_in_range for every pair """
+        if not attackers or not targets:
+            return np.zeros((len(attackers), len(targets)), dtype=bool)
+        types = self.type_indices(attackers)
+        attacker_positions = np.array([unit.position for unit in attackers], dtype=float)
+        attacker_radius = np.array([unit.radius for unit in attackers], dtype=float)
+        target_positions = np.array([unit.position for unit in targets], dtype=float)
+        target_radius = np.array([unit.radius for unit in targets], dtype=float)
+        target_flying = np.array([unit.is_flying for unit in targets], dtype=bool)
+        ranges = np.where(target_flying[None, :], self.air_range[types][:, None], self.ground_range[types][:, None])
+        differences = attacker_positions[:, None, :] - target_positions[None, :, :]
+        distances = np.hypot(differences[..., 0], differences[..., 1])
+        return distances + bonus_distance <= attacker_radius[:, None] + target_radius[None, :] + ranges